@@ -14,15 +14,15 @@ from starlette.responses import FileResponse
 from starlette.staticfiles import StaticFiles
 
 from src import api
-from src.core import config, db
+from src.core import config, db, http
 from src.core.extensions import configure_extensions
 from src.core.logging import logger
 from src.middlewares.exception import ExceptionMiddleware
 from src.middlewares.time import TimeMiddleware
+from src.services.accounting import service as accounting_service
 from src.services.auth import flows as auth_flows
-from src.services.integrations.discord import service as discord_service
 from src.services.integrations.discord.oauth.service import discord_app
-from src.services.integrations.telegram import service as telegram_service
+from src.services.integrations.notifications import service as notifications_service
 from src.services.settings import service as settings_service
 
 if os.name != "nt":
@@ -39,11 +39,12 @@ async def lifespan(_: FastAPI):
     async with db.async_session_maker() as session:
         await settings_service.create(session)
         await auth_flows.create_first_superuser(session)
+        await accounting_service.recalculate_active_orders(session)
     await discord_app.start()
     logger.info("Application... Online!")
     yield
-    await telegram_service.telegram_client.aclose()
-    await discord_service.discord_client.aclose()
+    await notifications_service.drain(config.app.notification_drain_timeout)
+    await http.close_all()
     await discord_app.close()
 
 
@@ -61,7 +62,6 @@ app = FastAPI(
     debug=config.app.debug,
     exception_handlers=exception_handlers,
 )
-app.add_middleware(ExceptionMiddleware)
 app.add_middleware(SentryAsgiMiddleware)
 app.add_middleware(TimeMiddleware)
 app.add_middleware(GZipMiddleware, minimum_size=1000)
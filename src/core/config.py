@@ -55,11 +55,15 @@ class AppConfig(BaseSettings):
     discord_oauth_secret: str
     algorithm: str = "HS256"
     expires_s: int = 3600
+    refresh_token_expires_s: int = 24 * 3600 * 30
+    refresh_token_cleanup_batch: int = 5000
     access_token_audience: str = "dude_duck:access"
     verification_token_audience: str = "dude_duck:verify"
     reset_password_token_audience: str = "dude_duck:reset"
     request_verify_email_token_audience: str = "dude_duck:request_verify_email"
     discord_oauth_token_audience: str = "dude_duck:discord_oauth"
+    principal_cache_ttl: int = 60
+    password_hash_workers: int = 4
 
     # super user
     super_user_username: str
@@ -73,6 +77,67 @@ class AppConfig(BaseSettings):
     celery_preorders_manage: int = 300
     celery_remove_expired_tokens: int = 300
 
+    # Pagination
+    count_cache_ttl: int = 30
+    count_estimate_threshold: int = 100_000
+
+    # Orders
+    order_payload_cache_ttl: int = 300
+
+    # Render
+    render_template_cache_size: int = 400
+    render_bytecode_cache_dir: str | None = None
+    render_output_cache_ttl: int = 600
+
+    # Messages
+    message_fan_out_concurrency: int = 5
+
+    # Bot clients
+    bot_connect_timeout: float = 3.0
+    bot_read_timeout: float = 10.0
+    bot_pool_timeout: float = 5.0
+    # Read timeout per endpoint prefix, e.g. '{"message/order/bulk": 30}'
+    bot_endpoint_timeouts: dict[str, float] = {"message/order/bulk": 30.0, "capabilities": 3.0}
+    bot_max_connections: int = 20
+    bot_max_keepalive_connections: int = 10
+    bot_keepalive_expiry: float = 30.0
+    bot_breaker_threshold: int = 5
+    bot_breaker_reset_timeout: float = 30.0
+    bot_metrics_window: int = 1000
+
+    # Bot rate limits as (requests per second, burst). Global budgets apply per integration, route
+    # budgets per channel or chat and are matched by the longest "integration:path prefix"
+    ratelimit_global: dict[str, tuple[float, float]] = {"discord": (50.0, 50.0), "telegram": (30.0, 30.0)}
+    ratelimit_routes: dict[str, tuple[float, float]] = {
+        "discord:message": (1.0, 5.0),
+        "discord:notification": (1.0, 5.0),
+        "telegram:message": (1.0, 1.0),
+        "telegram:notification": (1.0, 1.0),
+    }
+    ratelimit_max_retries: int = 3
+    ratelimit_max_buckets: int = 10_000
+
+    # Notifications
+    notification_queue_size: int = 1000
+    # Seconds a producer waits for room in a full queue before sending the notification itself
+    notification_put_timeout: float = 5.0
+    notification_workers: int = 4
+    notification_batch_size: int = 50
+    notification_targets_cache_ttl: int = 300
+    notification_drain_timeout: float = 10.0
+    # System notifications of these types are summarized per window (seconds), 0 sends them one by one
+    notification_digest_window: float = 0.0
+    notification_digest_types: list[str] = ["order_sent_notify", "order_edited_notify", "order_deleted_notify"]
+
+    # Outbox
+    outbox_drain_interval: int = 5
+    outbox_batch_size: int = 100
+    outbox_max_attempts: int = 10
+    # Seconds an entry stays claimed by a worker before another one may retry it
+    outbox_lock_timeout: int = 300
+    # Keep below the connection pool size (5 + 10 overflow): every delivery opens its own session
+    outbox_delivery_concurrency: int = 4
+
     # Sheets
     sync_boosters: bool = False
     datetime_format_sheets: str = "%d.%m.%Y %H:%M:%S"
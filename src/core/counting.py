@@ -0,0 +1,106 @@
+import hashlib
+from collections import defaultdict
+
+import sqlalchemy as sa
+from cashews import cache
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction, UOWTransaction
+from sqlalchemy.sql.util import find_tables
+
+from src.core import config
+
+__all__ = (
+    "count",
+    "invalidate",
+)
+
+# Bumped when a session that wrote to a table commits. The versions of the tables a count query
+# reads are part of its cache key, so a committed write makes the cached total unreachable.
+# The versions live in this process only: writes made by other processes (Celery workers, other
+# API replicas) are not seen here, and for them ``count_cache_ttl`` is the only bound on staleness.
+TABLE_VERSIONS: dict[str, int] = defaultdict(int)
+
+_PENDING_KEY = "counting_pending_tables"
+
+
+def invalidate(*tables: str) -> None:
+    for table in tables:
+        TABLE_VERSIONS[table] += 1
+
+
+def _pending(session: Session) -> set[str]:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, _: UOWTransaction) -> None:
+    _pending(session).update(obj.__table__.name for obj in (*session.new, *session.dirty, *session.deleted))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _do_orm_execute(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if table is not None:
+            _pending(state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    invalidate(*session.info.pop(_PENDING_KEY, ()))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_soft_rollback(session: Session, previous_transaction: SessionTransaction) -> None:
+    # A rolled back savepoint keeps what the outer transaction wrote before it
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+def _tables(query: sa.Select) -> list[str]:
+    tables = find_tables(query, check_columns=True)
+    return sorted({table.name for table in tables if isinstance(table, sa.Table)})
+
+
+def _cache_key(query: sa.Select, tables: list[str]) -> str:
+    compiled = query.compile(dialect=postgresql.dialect())
+    signature = f"{compiled}|{sorted(compiled.params.items(), key=lambda item: item[0])!r}"
+    digest = hashlib.sha1(signature.encode(), usedforsecurity=False).hexdigest()
+    versions = ".".join(f"{table}:{TABLE_VERSIONS[table]}" for table in tables)
+    return f"count:{digest}:{versions}"
+
+
+async def _estimate(session: AsyncSession, query: sa.Select, tables: list[str]) -> int | None:
+    if len(tables) != 1 or query.whereclause is not None:
+        return None
+    result = await session.execute(
+        sa.text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": f'"{tables[0]}"'},
+    )
+    reltuples = result.scalar_one_or_none()
+    if reltuples is None or reltuples < config.app.count_estimate_threshold:
+        return None
+    return reltuples
+
+
+async def count(session: AsyncSession, query: sa.Select, *, estimate: bool = False) -> tuple[int, bool]:
+    """Return ``(total, estimated)`` for a ``SELECT count(...)`` query.
+
+    Exact totals are cached per query signature for ``count_cache_ttl`` seconds. With ``estimate``
+    an unfiltered count over a large table is answered from the planner statistics instead.
+    """
+    tables = _tables(query)
+    if estimate:
+        total = await _estimate(session, query, tables)
+        if total is not None:
+            return total, True
+
+    key = _cache_key(query, tables)
+    total = await cache.get(key)
+    if total is None:
+        result = await session.execute(query)
+        total = result.scalar_one()
+        await cache.set(key, total, expire=config.app.count_cache_ttl)
+    return total, False
@@ -24,6 +24,16 @@ class ApiHTTPException(HTTPException):
         )
 
 
+def api_exceptions(error: ValidationError | ApiHTTPException) -> list[ApiException]:
+    """Per-item errors of a bulk operation, from a failed validation or a rejected item."""
+    if isinstance(error, ApiHTTPException):
+        return [ApiException.model_validate(e) for e in error.detail]
+    return [
+        ApiException(msg=f"{' -> '.join(map(str, err['loc']))}: {err['msg']}", code="invalid_data")
+        for err in error.errors()
+    ]
+
+
 class ValidationErrorDetail(BaseModel):
     location: str
     message: str
@@ -0,0 +1,229 @@
+import time
+import typing
+from collections import deque
+
+import httpx
+
+from src.core import config, ratelimit
+
+__all__ = (
+    "CircuitOpenError",
+    "IntegrationClient",
+    "clients",
+    "close_all",
+    "metrics",
+    "register",
+)
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised without touching the network while the circuit of an integration is open."""
+
+    def __init__(self, name: str, retry_in: float) -> None:
+        super().__init__(f"Circuit for {name} is open, retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker.
+
+    After ``threshold`` failures in a row the circuit opens and requests fail fast for ``reset_timeout``
+    seconds. Then a single probe is let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int, reset_timeout: float) -> None:
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def retry_in(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0)
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.probing or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+    def abort(self) -> None:
+        """Release the half-open probe slot of a request that ended without an outcome (e.g. cancelled)."""
+        self.probing = False
+
+
+class ClientMetrics:
+    def __init__(self, window: int) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.status_codes: dict[int, int] = {}
+        self.latencies: deque[float] = deque(maxlen=window)
+
+    def observe(self, elapsed: float, status_code: int | None) -> None:
+        self.requests += 1
+        self.latencies.append(elapsed)
+        if status_code is None:
+            self.errors += 1
+        else:
+            self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+            if status_code >= 500:
+                self.errors += 1
+
+    def _percentile(self, ordered: list[float], q: float) -> float | None:
+        if not ordered:
+            return None
+        return round(ordered[min(int(len(ordered) * q), len(ordered) - 1)] * 1000, 2)
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        ordered = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "status_codes": dict(self.status_codes),
+            "latency_ms_p50": self._percentile(ordered, 0.5),
+            "latency_ms_p95": self._percentile(ordered, 0.95),
+            "latency_ms_max": round(ordered[-1] * 1000, 2) if ordered else None,
+        }
+
+
+class IntegrationClient:
+    """``httpx.AsyncClient`` for a bot integration with HTTP/2, bounded pool, timeouts and a circuit breaker.
+
+    ``endpoint_timeouts`` maps an endpoint prefix (e.g. ``"message/order/bulk"``) to its read timeout;
+    the longest matching prefix wins, everything else uses ``bot_read_timeout``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        headers: dict[str, str] | None = None,
+        *,
+        endpoint_timeouts: dict[str, float] | None = None,
+        **kwargs: typing.Any,
+    ) -> None:
+        self.name = name
+        self.endpoint_timeouts = dict(
+            sorted((endpoint_timeouts or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        )
+        self.breaker = CircuitBreaker(config.app.bot_breaker_threshold, config.app.bot_breaker_reset_timeout)
+        self.metrics = ClientMetrics(config.app.bot_metrics_window)
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=config.app.bot_max_connections,
+                max_keepalive_connections=config.app.bot_max_keepalive_connections,
+                keepalive_expiry=config.app.bot_keepalive_expiry,
+            ),
+            timeout=self._timeout(config.app.bot_read_timeout),
+            **kwargs,
+        )
+
+    @staticmethod
+    def _timeout(read: float) -> httpx.Timeout:
+        return httpx.Timeout(
+            read,
+            connect=config.app.bot_connect_timeout,
+            pool=config.app.bot_pool_timeout,
+        )
+
+    def timeout_for(self, endpoint: str) -> httpx.Timeout:
+        for prefix, read in self.endpoint_timeouts.items():
+            if endpoint.startswith(prefix):
+                return self._timeout(read)
+        return self._timeout(config.app.bot_read_timeout)
+
+    async def request(
+        self, method: str, endpoint: str, *, rate_key: typing.Hashable | None = None, **kwargs: typing.Any
+    ) -> httpx.Response:
+        """Send a request through the rate limiter of ``rate_key`` (channel or chat), retrying after ``429``."""
+        retries = config.app.ratelimit_max_retries
+        for attempt in range(retries + 1):
+            await ratelimit.acquire(self.name, endpoint, rate_key)
+            response = await self._send(method, endpoint, **kwargs)
+            if response.status_code != 429 or attempt == retries:
+                break
+            ratelimit.block(self.name, endpoint, rate_key, ratelimit.retry_after(response))
+        return response
+
+    async def _send(self, method: str, endpoint: str, **kwargs: typing.Any) -> httpx.Response:
+        if not self.breaker.allow():
+            self.metrics.rejected += 1
+            raise CircuitOpenError(self.name, self.breaker.retry_in())
+        kwargs.setdefault("timeout", self.timeout_for(endpoint))
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, f"api/{endpoint}", **kwargs)
+        except httpx.HTTPError:
+            self.metrics.observe(time.perf_counter() - started, None)
+            self.breaker.failure()
+            raise
+        except BaseException:
+            self.breaker.abort()
+            raise
+        self.metrics.observe(time.perf_counter() - started, response.status_code)
+        if response.status_code >= 500:
+            self.breaker.failure()
+        else:
+            self.breaker.success()
+        return response
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            **self.metrics.snapshot(),
+        }
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+clients: dict[str, IntegrationClient] = {}
+
+
+def register(client: IntegrationClient) -> IntegrationClient:
+    clients[client.name] = client
+    return client
+
+
+def metrics() -> dict[str, dict[str, typing.Any]]:
+    return {name: client.snapshot() for name, client in clients.items()}
+
+
+async def close_all() -> None:
+    for client in clients.values():
+        await client.aclose()
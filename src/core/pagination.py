@@ -1,14 +1,21 @@
+import base64
+import datetime
+import enum
 from enum import Enum
-from typing import Generic, List, TypedDict, TypeVar
+from typing import Any, ClassVar, Generic, List, TypedDict, TypeVar
 
+import orjson
 from pydantic import BaseModel, Field
-from sqlalchemy import Select, text
+from sqlalchemy import Select, text, tuple_
+from starlette import status
 
-from . import db
+from . import db, errors
 
 __all__ = (
+    "PageParams",
     "Paginated",
     "PaginationParams",
+    "paginated_dict",
 )
 
 
@@ -28,6 +35,8 @@ class Paginated(BaseModel, Generic[SchemaType]):
     per_page: int
     total: int
     results: List[SchemaType]
+    next_cursor: str | None = None
+    estimated: bool = False
 
 
 class SortOrder(Enum):
@@ -35,11 +44,9 @@ class SortOrder(Enum):
     DESC = "desc"
 
 
-class PaginationParams(BaseModel):
+class PageParams(BaseModel):
     page: int = Field(1, ge=1)
     per_page: int = Field(10, ge=1, le=100)
-    sort: str = "created_at"
-    order: SortOrder = SortOrder.ASC
 
     @property
     def offset(self) -> int:
@@ -49,10 +56,87 @@ class PaginationParams(BaseModel):
     def limit(self) -> int:
         return self.per_page
 
+
+class PaginationParams(PageParams):
+    sort: str = "created_at"
+    order: SortOrder = SortOrder.ASC
+    cursor: str | None = None
+
+    # Subclasses opt in to keyset pagination by naming the model and the indexed,
+    # non-nullable columns that may be used for keyset sorting. Ties are broken on ``id``.
+    # Sorting on any other column keeps the plain OFFSET pagination without a cursor.
+    sort_model: ClassVar[type[db.TimeStampMixin] | None] = None
+    sort_columns: ClassVar[tuple[str, ...]] = ("created_at", "id")
+
     @property
     def order_by(self):
         order_by = " DESC" if self.order == SortOrder.DESC else ""
         return text(f"{self.sort}{order_by}")
 
+    @property
+    def is_keyset(self) -> bool:
+        return self.sort_model is not None and self.sort in self.sort_columns
+
+    def _decode_cursor(self, column) -> tuple[Any, int]:
+        try:
+            value, row_id = orjson.loads(base64.urlsafe_b64decode(self.cursor.encode()))  # type: ignore
+            python_type = column.type.python_type
+            if value is not None and issubclass(python_type, datetime.datetime):
+                value = datetime.datetime.fromisoformat(value)
+            elif value is not None and issubclass(python_type, enum.Enum):
+                value = python_type(value)
+            return value, int(row_id)
+        except Exception as e:
+            raise errors.ApiHTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=[errors.ApiException(msg="Invalid pagination cursor", code="invalid_cursor")],
+            ) from e
+
     def apply_pagination(self, query: Select) -> Select:
-        return query.offset(self.offset).limit(self.limit).order_by(self.order_by)
+        if not self.is_keyset:
+            return query.offset(self.offset).limit(self.limit).order_by(self.order_by)
+
+        column = getattr(self.sort_model, self.sort)
+        id_column = self.sort_model.id  # type: ignore
+        desc = self.order == SortOrder.DESC
+        if column is id_column:
+            order_by = [id_column.desc() if desc else id_column.asc()]
+        else:
+            order_by = [column.desc(), id_column.desc()] if desc else [column.asc(), id_column.asc()]
+        query = query.order_by(*order_by).limit(self.limit)
+        if self.cursor is None:
+            return query.offset(self.offset)
+
+        value, row_id = self._decode_cursor(column)
+        if column is id_column:
+            return query.where(id_column < row_id if desc else id_column > row_id)
+        key, bound = tuple_(column, id_column), tuple_(value, row_id)
+        return query.where(key < bound if desc else key > bound)
+
+    def next_cursor(self, results: List[Any]) -> str | None:
+        if not self.is_keyset or len(results) < self.limit:
+            return None
+        last = results[-1]
+        value = getattr(last, self.sort)
+        if isinstance(value, enum.Enum):
+            value = value.value
+        return base64.urlsafe_b64encode(orjson.dumps([value, last.id])).decode()
+
+
+def paginated_dict(
+    params: PaginationParams,
+    total: int,
+    results: List[dict[str, Any]],
+    *,
+    next_cursor: str | None = None,
+    estimated: bool = False,
+) -> dict[str, Any]:
+    """Plain-dict counterpart of ``Paginated`` for endpoints that serialize rows directly."""
+    return {
+        "page": params.page,
+        "per_page": params.per_page,
+        "total": total,
+        "results": results,
+        "next_cursor": next_cursor,
+        "estimated": estimated,
+    }
@@ -0,0 +1,130 @@
+import asyncio
+import time
+import typing
+
+import httpx
+
+from src.core import config
+
+__all__ = (
+    "TokenBucket",
+    "acquire",
+    "block",
+    "retry_after",
+)
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``capacity``.
+
+    ``acquire`` waits for a token instead of failing; waiters are served in arrival order
+    because the lock is held while sleeping.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    @property
+    def idle(self) -> bool:
+        now = time.monotonic()
+        self._refill(now)
+        return not self._lock.locked() and self.tokens >= self.capacity and self.blocked_until <= now
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns the time waited in seconds."""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                delay = self.blocked_until - now
+                if delay <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    delay = (1 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def block(self, seconds: float) -> None:
+        """Hold every request for ``seconds``, e.g. after the platform answered with ``429``."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+_buckets: dict[tuple[str, str, typing.Hashable], TokenBucket] = {}
+
+
+def _route(integration: str, path: str) -> tuple[str, tuple[float, float]] | None:
+    best: tuple[str, tuple[float, float]] | None = None
+    for name, budget in config.app.ratelimit_routes.items():
+        route_integration, _, prefix = name.partition(":")
+        if route_integration != integration or not path.startswith(prefix):
+            continue
+        if best is None or len(prefix) > len(best[0]):
+            best = (prefix, budget)
+    return best
+
+
+def _prune() -> None:
+    if len(_buckets) < config.app.ratelimit_max_buckets:
+        return
+    for bucket_key in [bucket_key for bucket_key, bucket in _buckets.items() if bucket.idle]:
+        del _buckets[bucket_key]
+
+
+def _bucket(bucket_key: tuple[str, str, typing.Hashable], budget: tuple[float, float]) -> TokenBucket:
+    bucket = _buckets.get(bucket_key)
+    if bucket is None:
+        _prune()
+        bucket = _buckets[bucket_key] = TokenBucket(*budget)
+    return bucket
+
+
+def _buckets_for(integration: str, path: str, key: typing.Hashable | None) -> list[TokenBucket]:
+    buckets = []
+    route = _route(integration, path)
+    if key is not None and route is not None:
+        prefix, budget = route
+        buckets.append(_bucket((integration, prefix, key), budget))
+    budget = config.app.ratelimit_global.get(integration)
+    if budget is not None:
+        buckets.append(_bucket((integration, "", None), budget))
+    return buckets
+
+
+async def acquire(integration: str, path: str, key: typing.Hashable | None = None) -> float:
+    """Wait for the per-route bucket of ``key`` (a channel or chat) and then for the integration-wide bucket."""
+    waited = 0.0
+    for bucket in _buckets_for(integration, path, key):
+        waited += await bucket.acquire()
+    return waited
+
+
+def block(integration: str, path: str, key: typing.Hashable | None, seconds: float) -> None:
+    buckets = _buckets_for(integration, path, key)
+    if buckets:
+        # Without a key the limit hit is the integration-wide one
+        buckets[0 if key is not None else -1].block(seconds)
+
+
+def retry_after(response: httpx.Response) -> float:
+    """Seconds to wait after a ``429``, from the ``Retry-After`` header or the ``retry_after`` body field."""
+    header = response.headers.get("Retry-After")
+    if header is not None:
+        try:
+            return float(header)
+        except ValueError:
+            pass
+    try:
+        return float(response.json().get("retry_after", 1.0))
+    except (ValueError, AttributeError):
+        return 1.0
@@ -1,56 +1,80 @@
+from typing import TYPE_CHECKING
+
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.responses import ORJSONResponse
 from loguru import logger
 from pydantic import ValidationError
 from starlette import status
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
 
 from src.core import config, errors
 
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class ExceptionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        try:
-            response = await call_next(request)
-        except RequestValidationError as e:
-            if config.app.debug:
-                logger.exception("What!?")
-            response = ORJSONResponse(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                content={
-                    "detail": [
-                        {
-                            "msg": jsonable_encoder(e.errors(), exclude={"url", "type", "ctx"}),
-                            "code": "unprocessable_entity",
-                        }
-                    ]
-                },
-            )
-        except ValidationError as e:
+
+def exception_response(e: Exception) -> ORJSONResponse:
+    if isinstance(e, RequestValidationError):
+        if config.app.debug:
             logger.exception("What!?")
-            response = ORJSONResponse(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                content={
-                    "detail": [
-                        {
-                            "msg": e.errors(include_url=False),
-                            "code": "unprocessable_entity",
-                        }
-                    ]
-                },
-            )
-        except errors.ApiHTTPException as e:
-            response = ORJSONResponse(content={"detail": e.detail}, status_code=e.status_code)
-        except HTTPException as e:
-            response = ORJSONResponse(content={"detail": [e.detail]}, status_code=e.status_code)
-        except Exception as e:
-            logger.exception(e)
-            response = ORJSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={"detail": [{"msg": "Unknown", "code": "Unknown"}]},
-            )
+        return ORJSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content={
+                "detail": [
+                    {
+                        "msg": jsonable_encoder(e.errors(), exclude={"url", "type", "ctx"}),
+                        "code": "unprocessable_entity",
+                    }
+                ]
+            },
+        )
+    if isinstance(e, ValidationError):
+        logger.exception("What!?")
+        return ORJSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content={
+                "detail": [
+                    {
+                        "msg": e.errors(include_url=False),
+                        "code": "unprocessable_entity",
+                    }
+                ]
+            },
+        )
+    if isinstance(e, errors.ApiHTTPException):
+        return ORJSONResponse(content={"detail": e.detail}, status_code=e.status_code)
+    if isinstance(e, HTTPException):
+        return ORJSONResponse(content={"detail": [e.detail]}, status_code=e.status_code)
+    logger.exception(e)
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": [{"msg": "Unknown", "code": "Unknown"}]},
+    )
+
+
+class ExceptionMiddleware:
+    __slots__ = ("app",)
 
-        return response
+    def __init__(self, app: "ASGIApp") -> None:
+        self.app = app
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send") -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: "Message") -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            # Once the headers are out the status can't change, let the server close the connection
+            if response_started:
+                raise
+            await exception_response(e)(scope, receive, send)
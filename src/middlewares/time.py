@@ -1,32 +1,43 @@
 import time
+from typing import TYPE_CHECKING
 
-from fastapi import FastAPI
 from loguru import logger
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
 
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class TimeMiddleware(BaseHTTPMiddleware):
-    def __init__(
-        self,
-        app: FastAPI,
-    ) -> None:
-        super().__init__(app)
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+class TimeMiddleware:
+    __slots__ = ("app",)
+
+    def __init__(self, app: "ASGIApp") -> None:
+        self.app = app
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send") -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        if request.client is not None:
-            logger.info(
-                f'{request.client.host}:{request.client.port} - "{request.method} {request.url.path}" '
-                f"{response.status_code} [process time: {int(process_time * 1000)} ms]"
-            )
-        else:
+        status_code = 500
+        process_time = 0.0
+
+        async def send_wrapper(message: "Message") -> None:
+            nonlocal status_code, process_time
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = time.time() - start_time
+                MutableHeaders(scope=message)["X-Process-Time"] = str(process_time)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            process_time = process_time or time.time() - start_time
+            client = scope.get("client")
+            source = f"{client[0]}:{client[1]}" if client else "Unknown"
             logger.info(
-                f'Unknown - "{request.method} {request.url.path}" '
-                f"{response.status_code} [process time: {int(process_time * 1000)} ms]"
+                f'{source} - "{scope["method"]} {scope["path"]}" '
+                f"{status_code} [process time: {int(process_time * 1000)} ms]"
             )
-        return response
@@ -0,0 +1,34 @@
+"""user active orders counter
+
+Revision ID: 9f21e841462c
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9f21e841462c"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("user", sa.Column("active_orders", sa.Integer(), server_default="0", nullable=False))
+    op.execute(
+        """
+        UPDATE "user" SET active_orders = (
+            SELECT count(user_order.id) FROM user_order
+            WHERE user_order.user_id = "user".id AND user_order.completed = false
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("user", "active_orders")
@@ -0,0 +1,48 @@
+"""order search trigram indexes
+
+Revision ID: bbaa07aeacac
+Revises: 9f21e841462c
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "bbaa07aeacac"
+down_revision: Union[str, None] = "9f21e841462c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("order", "order_id"),
+    ("order", "shop_order_id"),
+    ("order_info", "comment"),
+    ("order_info", "purchase"),
+    ("order_info", "server"),
+    ("order_credentials", "battle_tag"),
+    ("order_credentials", "nickname"),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for table, column in INDEXES:
+            op.create_index(
+                f"ix_{table}_{column}_trgm",
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column in INDEXES:
+            op.drop_index(f"ix_{table}_{column}_trgm", table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,54 @@
+"""hot lookup indexes
+
+Revision ID: 86f62cfb511f
+Revises: bbaa07aeacac
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "86f62cfb511f"
+down_revision: Union[str, None] = "bbaa07aeacac"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_order_order_id", "order", ["order_id"]),
+    ("ix_order_spreadsheet_sheet_id_row_id", "order", ["spreadsheet", "sheet_id", "row_id"]),
+    ("ix_order_created_at_id", "order", ["created_at", "id"]),
+    ("ix_order_date_id", "order", ["date", "id"]),
+    ("ix_order_info_order_id", "order_info", ["order_id"]),
+    ("ix_order_price_order_id", "order_price", ["order_id"]),
+    ("ix_order_credentials_order_id", "order_credentials", ["order_id"]),
+    ("ix_screenshot_created_at_id", "screenshot", ["created_at", "id"]),
+    ("ix_user_order_order_id", "user_order", ["order_id"]),
+    ("ix_response_order_id_is_preorder_user_id", "response", ["order_id", "is_preorder", "user_id"]),
+    ("ix_response_user_id_is_preorder", "response", ["user_id", "is_preorder"]),
+    ("ix_response_created_at_id", "response", ["created_at", "id"]),
+    ("ix_integration_channel_game_category_integration", "integration_channel", ["game", "category", "integration"]),
+    ("ix_integration_order_message_order_id", "integration_order_message", ["order_id", "integration", "is_preorder"]),
+    ("ix_integration_order_message_created_at_id", "integration_order_message", ["created_at", "id"]),
+    ("ix_integration_response_message_order_id", "integration_response_message", ["order_id", "user_id", "integration"]),
+    ("ix_integration_user_message_message_id", "integration_user_message", ["message_id"]),
+    ("ix_preorder_order_id", "preorder", ["order_id"]),
+    ("ix_preorder_spreadsheet_sheet_id_row_id", "preorder", ["spreadsheet", "sheet_id", "row_id"]),
+    ("ix_preorder_info_order_id", "preorder_info", ["order_id"]),
+    ("ix_preorder_price_order_id", "preorder_price", ["order_id"]),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction, but it doesn't block writes on live tables
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
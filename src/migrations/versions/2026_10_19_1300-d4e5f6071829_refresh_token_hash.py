@@ -0,0 +1,38 @@
+"""refresh token hash
+
+Revision ID: d4e5f6071829
+Revises: c3d4e5f60718
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6071829"
+down_revision: Union[str, None] = "c3d4e5f60718"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("refresh_token", sa.Column("token_hash", sa.String(length=64), nullable=True))
+    # Existing sessions keep working: the hash is the same sha256 hex digest the service computes
+    op.execute("UPDATE refresh_token SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')")
+    op.alter_column("refresh_token", "token_hash", nullable=False)
+    op.create_unique_constraint("refresh_token_token_hash_key", "refresh_token", ["token_hash"])
+    op.drop_column("refresh_token", "token")
+    op.create_index("ix_refresh_token_created_at_id", "refresh_token", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    # Plain tokens can't be recovered from their hashes, so every session has to log in again
+    op.drop_index("ix_refresh_token_created_at_id", table_name="refresh_token")
+    op.execute("DELETE FROM refresh_token")
+    op.add_column("refresh_token", sa.Column("token", sa.String(), nullable=False))
+    op.create_unique_constraint("refresh_token_token_key", "refresh_token", ["token"])
+    op.drop_constraint("refresh_token_token_hash_key", "refresh_token", type_="unique")
+    op.drop_column("refresh_token", "token_hash")
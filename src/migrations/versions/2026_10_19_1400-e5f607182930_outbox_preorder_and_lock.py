@@ -0,0 +1,42 @@
+"""outbox preorder and lock
+
+Revision ID: e5f607182930
+Revises: d4e5f6071829
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f607182930"
+down_revision: Union[str, None] = "d4e5f6071829"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("outbox", sa.Column("preorder_id", sa.BigInteger(), nullable=True))
+    op.add_column("outbox", sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True))
+    # Preorder side effects used to be keyed by order_id
+    op.execute(
+        "UPDATE outbox SET preorder_id = order_id, order_id = NULL "
+        "WHERE kind = 'DELETE_ORDER_MESSAGE' AND (payload ->> 'is_preorder')::boolean"
+    )
+    op.create_index(
+        "ix_outbox_pending_preorder",
+        "outbox",
+        ["preorder_id", "id"],
+        unique=False,
+        postgresql_where="processed_at IS NULL",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_pending_preorder", table_name="outbox", postgresql_where="processed_at IS NULL")
+    op.execute("UPDATE outbox SET order_id = preorder_id WHERE preorder_id IS NOT NULL")
+    op.drop_column("outbox", "locked_until")
+    op.drop_column("outbox", "preorder_id")
@@ -0,0 +1,34 @@
+"""message keyset indexes
+
+Revision ID: f60718293a41
+Revises: e5f607182930
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f60718293a41"
+down_revision: Union[str, None] = "e5f607182930"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_integration_response_message_created_at_id", "integration_response_message", ["created_at", "id"]),
+    ("ix_integration_user_message_created_at_id", "integration_user_message", ["created_at", "id"]),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -14,3 +14,4 @@ from .preorder import *
 from .response import *
 from .settings import *
 from .oauth import *
+from .outbox import *
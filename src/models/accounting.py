@@ -1,6 +1,6 @@
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, UniqueConstraint, event
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, UniqueConstraint, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core import db
@@ -18,6 +18,7 @@ class UserOrder(db.TimeStampMixin):
     __table_args__ = (
         # Index("idx_user_order", user_id, order_id, unique=True),
         UniqueConstraint("user_id", "order_id", name="u_user_order"),
+        Index("ix_user_order_order_id", "order_id"),
     )
 
     user_id: Mapped[int] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"))
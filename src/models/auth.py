@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core import db
@@ -21,12 +21,15 @@ class User(db.TimeStampMixin):
     is_verified_email: Mapped[bool] = mapped_column(default=False)
     name: Mapped[str] = mapped_column(String(20), unique=True)
     max_orders: Mapped[int] = mapped_column(default=3)
+    active_orders: Mapped[int] = mapped_column(default=0, server_default="0")
 
 
 class RefreshToken(db.TimeStampMixin):
     __tablename__ = "refresh_token"
+    __table_args__ = (Index("ix_refresh_token_created_at_id", "created_at", "id"),)
 
-    token: Mapped[str] = mapped_column(String(), unique=True)
+    # sha256 hex digest of the token; the token itself is never stored
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"))
     user: Mapped["User"] = relationship()
 
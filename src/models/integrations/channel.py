@@ -1,4 +1,4 @@
-from sqlalchemy import BigInteger, Enum,  String
+from sqlalchemy import BigInteger, Enum, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.core import db, enums
@@ -8,6 +8,7 @@ __all__ = ("Channel", )
 
 class Channel(db.TimeStampMixin):
     __tablename__ = "integration_channel"
+    __table_args__ = (Index("ix_integration_channel_game_category_integration", "game", "category", "integration"),)
 
     game: Mapped[str] = mapped_column(String(), nullable=False)
     category: Mapped[str | None] = mapped_column(String(), nullable=True)
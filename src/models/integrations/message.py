@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import BigInteger, Boolean, Enum, ForeignKey
+from sqlalchemy import BigInteger, Boolean, Enum, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core import db, enums
@@ -24,6 +24,7 @@ class CallbackStatus(str, enum.Enum):
     SAME_TEXT = "same_text"
     FORBIDDEN = "forbidden"
     EXISTS = "exists"
+    FAILED = "failed"
 
     INTEGRATION_NOT_FOUND = "integration not found"
 
@@ -39,6 +40,10 @@ class Message(db.TimeStampMixin):
 
 class OrderMessage(Message):
     __tablename__ = "integration_order_message"
+    __table_args__ = (
+        Index("ix_integration_order_message_order_id", "order_id", "integration", "is_preorder"),
+        Index("ix_integration_order_message_created_at_id", "created_at", "id"),
+    )
 
     order_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     is_preorder: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -46,6 +51,10 @@ class OrderMessage(Message):
 
 class ResponseMessage(Message):
     __tablename__ = "integration_response_message"
+    __table_args__ = (
+        Index("ix_integration_response_message_order_id", "order_id", "user_id", "integration"),
+        Index("ix_integration_response_message_created_at_id", "created_at", "id"),
+    )
 
     order_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("user.id"))
@@ -55,6 +64,10 @@ class ResponseMessage(Message):
 
 class UserMessage(Message):
     __tablename__ = "integration_user_message"
+    __table_args__ = (
+        Index("ix_integration_user_message_message_id", "message_id"),
+        Index("ix_integration_user_message_created_at_id", "created_at", "id"),
+    )
 
     user_id: Mapped[int] = mapped_column(ForeignKey("user.id"))
     user: Mapped[User] = relationship()
@@ -26,6 +26,7 @@ class NotificationType(enum.Enum):
     ORDER_DELETED_NOTIFY = "order_deleted_notify"
     RESPONSE_CHOSE_NOTIFY = "response_chose_notify"
     ORDER_PAID_NOTIFY = "order_paid_notify"
+    DIGEST_NOTIFY = "digest_notify"
 
 
 class UserNotification(db.TimeStampMixin):
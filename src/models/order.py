@@ -1,7 +1,7 @@
 import enum
 from datetime import UTC, datetime
 
-from sqlalchemy import BigInteger, DateTime, Enum, Float, ForeignKey, String, UniqueConstraint
+from sqlalchemy import BigInteger, DateTime, Enum, Float, ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core import db
@@ -30,8 +30,25 @@ class OrderPaidStatus(enum.Enum):
     NotPaid = "Not Paid"
 
 
+def trgm_index(table: str, column: str) -> Index:
+    return Index(
+        f"ix_{table}_{column}_trgm",
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    )
+
+
 class Order(db.TimeStampMixin):
     __tablename__ = "order"
+    __table_args__ = (
+        Index("ix_order_order_id", "order_id"),
+        Index("ix_order_spreadsheet_sheet_id_row_id", "spreadsheet", "sheet_id", "row_id"),
+        Index("ix_order_created_at_id", "created_at", "id"),
+        Index("ix_order_date_id", "date", "id"),
+        trgm_index("order", "order_id"),
+        trgm_index("order", "shop_order_id"),
+    )
 
     order_id: Mapped[str] = mapped_column(String(10))
     spreadsheet: Mapped[str] = mapped_column(String())
@@ -55,6 +72,12 @@ class Order(db.TimeStampMixin):
 
 class OrderInfo(db.TimeStampMixin):
     __tablename__ = "order_info"
+    __table_args__ = (
+        Index("ix_order_info_order_id", "order_id"),
+        trgm_index("order_info", "comment"),
+        trgm_index("order_info", "purchase"),
+        trgm_index("order_info", "server"),
+    )
 
     order_id: Mapped[int] = mapped_column(ForeignKey("order.id", ondelete="CASCADE"))
     order: Mapped["Order"] = relationship(back_populates="info")
@@ -72,6 +95,7 @@ class OrderInfo(db.TimeStampMixin):
 
 class OrderPrice(db.TimeStampMixin):
     __tablename__ = "order_price"
+    __table_args__ = (Index("ix_order_price_order_id", "order_id"),)
 
     order_id: Mapped[int] = mapped_column(ForeignKey("order.id", ondelete="CASCADE"))
     order: Mapped["Order"] = relationship(back_populates="price")
@@ -83,6 +107,11 @@ class OrderPrice(db.TimeStampMixin):
 
 class OrderCredentials(db.TimeStampMixin):
     __tablename__ = "order_credentials"
+    __table_args__ = (
+        Index("ix_order_credentials_order_id", "order_id"),
+        trgm_index("order_credentials", "battle_tag"),
+        trgm_index("order_credentials", "nickname"),
+    )
 
     order_id: Mapped[int] = mapped_column(ForeignKey("order.id", ondelete="CASCADE"))
     order: Mapped["Order"] = relationship(back_populates="credentials")
@@ -96,7 +125,10 @@ class OrderCredentials(db.TimeStampMixin):
 
 class Screenshot(db.TimeStampMixin):
     __tablename__ = "screenshot"
-    __table_args__ = (UniqueConstraint("order_id", "url", name="uix_order_url"),)
+    __table_args__ = (
+        UniqueConstraint("order_id", "url", name="uix_order_url"),
+        Index("ix_screenshot_created_at_id", "created_at", "id"),
+    )
 
     source: Mapped[str] = mapped_column(String(), nullable=False)
     url: Mapped[str] = mapped_column(String(), nullable=False)
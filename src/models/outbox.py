@@ -0,0 +1,36 @@
+import enum
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Enum, Index, Integer, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core import db
+
+__all__ = ("OutboxKind", "Outbox")
+
+
+class OutboxKind(str, enum.Enum):
+    DELETE_ORDER_MESSAGE = "delete_order_message"
+    SHEETS_UPDATE_ORDER = "sheets_update_order"
+
+
+class Outbox(db.TimeStampMixin):
+    __tablename__ = "outbox"
+    __table_args__ = (
+        Index("ix_outbox_pending", "order_id", "id", postgresql_where="processed_at IS NULL"),
+        Index("ix_outbox_pending_preorder", "preorder_id", "id", postgresql_where="processed_at IS NULL"),
+    )
+
+    # Stored as a string so new kinds do not need a migration
+    kind: Mapped[OutboxKind] = mapped_column(Enum(OutboxKind, native_enum=False, length=64))
+    # Entries with the same order_id (or preorder_id) are delivered one at a time in id order
+    order_id: Mapped[int | None] = mapped_column(BigInteger(), nullable=True)
+    preorder_id: Mapped[int | None] = mapped_column(BigInteger(), nullable=True)
+    payload: Mapped[dict] = mapped_column(JSONB())
+    attempts: Mapped[int] = mapped_column(Integer(), default=0, server_default="0")
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+    # Set while a worker delivers the entry; an entry whose lock expired is claimed again
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text(), nullable=True)
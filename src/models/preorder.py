@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, String
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core import db
@@ -14,6 +14,10 @@ __all__ = (
 
 class PreOrder(db.TimeStampMixin):
     __tablename__ = "preorder"
+    __table_args__ = (
+        Index("ix_preorder_order_id", "order_id"),
+        Index("ix_preorder_spreadsheet_sheet_id_row_id", "spreadsheet", "sheet_id", "row_id"),
+    )
 
     order_id: Mapped[str] = mapped_column(String(10))
     spreadsheet: Mapped[str] = mapped_column(String())
@@ -30,6 +34,7 @@ class PreOrder(db.TimeStampMixin):
 
 class PreOrderInfo(db.TimeStampMixin):
     __tablename__ = "preorder_info"
+    __table_args__ = (Index("ix_preorder_info_order_id", "order_id"),)
 
     order_id: Mapped[int] = mapped_column(ForeignKey("preorder.id", ondelete="CASCADE"))
     order: Mapped["PreOrder"] = relationship(back_populates="info")
@@ -47,6 +52,7 @@ class PreOrderInfo(db.TimeStampMixin):
 
 class PreOrderPrice(db.TimeStampMixin):
     __tablename__ = "preorder_price"
+    __table_args__ = (Index("ix_preorder_price_order_id", "order_id"),)
 
     order_id: Mapped[int] = mapped_column(ForeignKey("preorder.id", ondelete="CASCADE"))
     order: Mapped["PreOrder"] = relationship(back_populates="price")
@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Interval, Select, String
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Index, Interval, Select, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core import db
@@ -11,6 +11,11 @@ __all__ = ("Response", )
 
 class Response(db.TimeStampMixin):
     __tablename__ = "response"
+    __table_args__ = (
+        Index("ix_response_order_id_is_preorder_user_id", "order_id", "is_preorder", "user_id"),
+        Index("ix_response_user_id_is_preorder", "user_id", "is_preorder"),
+        Index("ix_response_created_at_id", "created_at", "id"),
+    )
 
     refund: Mapped[bool] = mapped_column(Boolean(), default=False)
     approved: Mapped[bool] = mapped_column(Boolean(), default=False)
@@ -8,6 +8,7 @@ from .response import *
 from .oauth import *
 from .users import *
 from .integrations.channel import *
+from .integrations.client import *
 from .integrations.message import *
 from .integrations.notification import *
 from .integrations.render import *
@@ -13,6 +13,7 @@ __all__ = (
     "UserUpdateAdmin",
 
     "BaseUserUpdate",
+    "PasswordHashingMetrics",
 )
 
 class UserRead(BaseModel):
@@ -64,3 +65,12 @@ class UserUpdateAdmin(BaseUserUpdate):
     is_verified_email: bool | None = Field(default=None)
 
     max_orders: int | None = Field(default=None)
+
+
+class PasswordHashingMetrics(BaseModel):
+    workers: int
+    calls: int
+    pending: int
+    queue_ms_p50: float | None
+    queue_ms_p95: float | None
+    queue_ms_max: float | None
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+__all__ = ("IntegrationClientMetrics",)
+
+
+class IntegrationClientMetrics(BaseModel):
+    state: str
+    consecutive_failures: int
+    requests: int
+    errors: int
+    rejected: int
+    status_codes: dict[int, int]
+    latency_ms_p50: float | None
+    latency_ms_p95: float | None
+    latency_ms_max: float | None
@@ -34,6 +34,7 @@ __all__ = (
 )
 
 from src.models import CallbackStatus
+from src.models.integrations.message import OrderMessage, ResponseMessage, UserMessage
 
 
 class MessageRead(BaseModel):
@@ -152,6 +153,8 @@ class MessageCallback(BaseModel):
 
 
 class OrderMessagePaginationParams(pagination.PaginationParams):
+    sort_model: typing.ClassVar = OrderMessage
+
     integration: enums.Integration
     channel_id: int | None = None
     order_id: int | None = None
@@ -169,6 +172,8 @@ class OrderMessagePaginationParams(pagination.PaginationParams):
 
 
 class ResponseMessagePaginationParams(pagination.PaginationParams):
+    sort_model: typing.ClassVar = ResponseMessage
+
     integration: enums.Integration
     order_id: int | None = None
     user_id: int | None = None
@@ -183,6 +188,8 @@ class ResponseMessagePaginationParams(pagination.PaginationParams):
 
 
 class UserMessagePaginationParams(pagination.PaginationParams):
+    sort_model: typing.ClassVar = UserMessage
+
     integration: enums.Integration
     user_id: int | None = None
 
@@ -1,10 +1,20 @@
+import datetime
+import typing
+
 from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import Select
 
 
 from src.core import enums, pagination
 
-__all__ = ("RenderConfigCreate", "RenderConfigUpdate", "RenderConfigRead", "RenderConfigParams")
+__all__ = (
+    "RenderConfigCreate",
+    "RenderConfigUpdate",
+    "RenderConfigRead",
+    "RenderConfigParams",
+    "RenderTemplate",
+    "RenderContext",
+)
 
 from src.models.integrations.render import RenderConfig
 
@@ -36,6 +46,37 @@ class RenderConfigRead(BaseModel):
     separator: str
 
 
+class RenderTemplate(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    name: str
+    binary: str
+    allow_separator_top: bool
+    separator: str
+    version: datetime.datetime | None
+
+
+class RenderContext(BaseModel):
+    """Every render config an order of ``game`` may need, detached from the session."""
+
+    model_config = ConfigDict(frozen=True)
+
+    integration: enums.Integration
+    game: str
+    templates: tuple[RenderTemplate, ...]
+
+    def get(self, name: str) -> RenderTemplate | None:
+        for template in self.templates:
+            if template.name == name:
+                return template
+        return None
+
+    def missing(self, names: typing.Iterable[str]) -> list[str]:
+        exist_names = {template.name for template in self.templates}
+        return [name for name in names if name not in exist_names]
+
+
 class RenderConfigParams(pagination.PaginationParams):
     names: list[str] | None = None
     allow_separator_top: bool | None = None
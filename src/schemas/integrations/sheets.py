@@ -1,6 +1,12 @@
+from pydantic import BaseModel, Field
+
+from src.core.errors import ApiException
+from src.models.general import SheetEntity
 from src.schemas.integrations.message import CreateOrderMessage, DeleteOrderMessage, UpdateOrderMessage
+from src.schemas.order import OrderReadSystem
+from src.schemas.preorder import PreOrderReadSystem
 
-__all__ = ("CreateOrderSheetMessage", "UpdateOrderSheetMessage", "DeleteOrderSheetMessage")
+__all__ = ("CreateOrderSheetMessage", "UpdateOrderSheetMessage", "DeleteOrderSheetMessage", "SheetEntityBulkResult")
 
 
 class CreateOrderSheetMessage(CreateOrderMessage):
@@ -13,3 +19,10 @@ class UpdateOrderSheetMessage(UpdateOrderMessage):
 
 class DeleteOrderSheetMessage(DeleteOrderMessage):
     order_id: str
+
+
+class SheetEntityBulkResult(BaseModel):
+    entity: SheetEntity
+    order_id: str | None = None
+    result: OrderReadSystem | PreOrderReadSystem | None = None
+    errors: list[ApiException] = Field(default=[])
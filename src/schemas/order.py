@@ -1,10 +1,12 @@
 import datetime
+import typing
 from enum import Enum
 
 from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 from sqlalchemy import Select
 
 from src.core import pagination
+from src.core.errors import ApiException
 from src.models.order import (
     Order,
     OrderInfo,
@@ -25,8 +27,11 @@ __all__ = (
     "OrderStatusFilter",
     "OrderFilterParams",
     "ScreenshotParams",
+    "OrderSearchParams",
     "OrderCreate",
     "OrderUpdate",
+    "OrderBulkUpdate",
+    "OrderBulkResult",
     "OrderInfoMetaRead",
     "OrderInfoRead",
     "OrderPriceMeta",
@@ -226,6 +231,9 @@ class OrderStatusFilter(Enum):
 
 
 class OrderFilterParams(pagination.PaginationParams):
+    sort_model: typing.ClassVar = Order
+    sort_columns: typing.ClassVar = ("created_at", "id", "date", "order_id")
+
     status: OrderStatusFilter = OrderStatusFilter.All
     order_id: list[str] | None = None
     ids: list[int] | None = None
@@ -247,7 +255,14 @@ class OrderFilterParams(pagination.PaginationParams):
         return query
 
 
+class OrderSearchParams(pagination.PageParams):
+    # Results are ranked by similarity to ``query``, so there is no sort or cursor
+    query: str = Field(min_length=3, max_length=100)
+
+
 class ScreenshotParams(pagination.PaginationParams):
+    sort_model: typing.ClassVar = Screenshot
+
     order_id: int | None = None
     user_id: int | None = None
     source: str | None = None
@@ -260,3 +275,14 @@ class ScreenshotParams(pagination.PaginationParams):
         if self.source:
             query = query.where(Screenshot.source.like(f"%{self.source}%"))
         return query
+
+
+class OrderBulkUpdate(OrderUpdate):
+    id: int
+
+
+class OrderBulkResult(BaseModel):
+    id: int | None = None
+    order_id: str | None = None
+    result: OrderReadSystem | None = None
+    errors: list[ApiException] = Field(default=[])
@@ -1,3 +1,4 @@
+import typing
 from datetime import datetime, timedelta
 
 from pydantic import BaseModel, ConfigDict
@@ -5,6 +6,7 @@ from sqlalchemy import Select
 
 from src.core import pagination
 from src import models
+from src.models.response import Response
 
 __all__ = ("ResponseExtra", "ResponseCreate", "ResponseRead", "ResponseUpdate", "ResponsePagination")
 
@@ -51,6 +53,8 @@ class ResponseUpdate(BaseModel):
 
 
 class ResponsePagination(pagination.PaginationParams):
+    sort_model: typing.ClassVar = Response
+
     order_id: int | None = None
     user_id: int | None = None
     is_preorder: bool | None = None
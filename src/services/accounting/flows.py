@@ -1,3 +1,4 @@
+import typing
 from datetime import UTC, date, datetime
 
 import sqlalchemy as sa
@@ -7,7 +8,7 @@ from sqlalchemy.sql.functions import count
 from starlette import status
 
 from src import models, schemas
-from src.core import errors, pagination
+from src.core import counting, errors, pagination
 from src.services.auth import flows as auth_flows
 from src.services.currency import flows as currency_flows
 from src.services.integrations.notifications import flows as notifications_flows
@@ -223,9 +224,10 @@ async def close_order(
         )
     await screenshot_service.create(session, user, order, data.url.unicode_string())
     update_model = schemas.OrderUpdate(end_date=datetime.now(tz=UTC))
-    new_order = await order_service.update(session, order, update_model)
+    new_order = await order_service.update(session, order, update_model, commit=False)
     await sheets_flows.order_to_sheets(session, new_order, await order_flows.format_order_system(session, new_order))
-    notifications_flows.send_order_close_notify(
+    await session.commit()
+    await notifications_flows.send_order_close_notify(
         schemas.UserRead.model_validate(user),
         order.order_id,
         str(data.url),
@@ -252,12 +254,13 @@ async def paid_order(session: AsyncSession, payment_id: int) -> models.UserOrder
     boosters = await service.get_by_order_id(session, order.id)
     if all(booster.paid for booster in boosters):
         update_model = schemas.OrderUpdate(status_paid=models.OrderPaidStatus.Paid)
-        new_order = await order_service.update(session, order, update_model)
+        new_order = await order_service.update(session, order, update_model, commit=False)
         await sheets_flows.order_to_sheets(
             session,
             new_order,
             await order_flows.format_order_system(session, new_order),
         )
+        await session.commit()
     return data
 
 
@@ -265,40 +268,26 @@ async def get_by_filter(
     session: AsyncSession,
     user: models.User,
     params: schemas.OrderFilterParams,
-) -> pagination.Paginated[schemas.OrderReadActive]:
+) -> dict[str, typing.Any]:
     query = (
-        sa.select(models.UserOrder, models.Order)
+        order_service.projection_query(schemas.OrderReadActive, models.UserOrder.dollars)
+        .add_columns(models.UserOrder.paid_at)
+        .join(models.UserOrder, models.UserOrder.order_id == models.Order.id)
         .where(models.UserOrder.user_id == user.id)
-        .join(
-            models.Order,
-            models.UserOrder.order_id == models.Order.id,
-            isouter=True,
-        )
-        .options(
-            joinedload(models.Order.info),
-            joinedload(models.Order.price),
-            joinedload(models.Order.credentials),
-            joinedload(models.Order.screenshots),
-        )
     )
     query = params.apply_filters(query)
     query = params.apply_pagination(query)
-    result = await session.execute(query)
-    results = []
+    rows = (await session.execute(query)).all()
     count_query = (
         sa.select(count(models.UserOrder.id))
         .join(models.Order, models.Order.id == models.UserOrder.order_id)
         .where(models.UserOrder.user_id == user.id)
     )
     count_query = params.apply_filters(count_query)
-    total = await session.execute(count_query)
-    for row in result.unique():
-        user_order: models.UserOrder = row[0]
-        order: models.Order = row[1]
-        results.append(await order_flows.format_order_active(session, order, user_order))
-    return pagination.Paginated(
-        page=params.page,
-        per_page=params.per_page,
-        total=total.one()[0],
-        results=results,
+    total, _ = await counting.count(session, count_query)
+    return pagination.paginated_dict(
+        params,
+        total,
+        await order_flows.project_orders(session, rows, schemas.OrderReadActive),
+        next_cursor=params.next_cursor(rows),
     )
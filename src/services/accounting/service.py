@@ -16,7 +16,7 @@ from src.services.integrations.sheets import flows as sheets_flows
 from src.services.integrations.sheets import service as sheets_service
 from src.services.order import flows as order_flows
 from src.services.order import service as order_service
-from src.services.tasks import service as tasks_service
+from src.services.outbox import service as outbox_service
 
 BOOSTER_WITH_PRICE_REGEX = re.compile(config.app.username_regex + r" ?(\(\d+\))", flags=re.UNICODE & re.MULTILINE)
 BOOSTER_REGEX = re.compile(config.app.username_regex, flags=re.UNICODE & re.MULTILINE)
@@ -60,6 +60,7 @@ async def get_by_orders(session: AsyncSession, orders_id: typing.Iterable[int])
 
 
 async def sync_boosters_sheet(session: AsyncSession, order: models.Order) -> None:
+    """Queue the booster column update in the outbox; the caller commits."""
     if config.app.sync_boosters:
         parser = await sheets_service.get_by_spreadsheet_sheet_read(session, order.spreadsheet, order.sheet_id)
         if parser is not None:
@@ -67,7 +68,12 @@ async def sync_boosters_sheet(session: AsyncSession, order: models.Order) -> Non
             query = sa.select(models.User).where(models.User.id.in_([d.user_id for d in user_orders]))
             users = await session.scalars(query)
             booster_str = await _boosters_to_str(session, order, user_orders, users.all())  # type: ignore
-            tasks_service.update_order.delay(parser.model_dump(mode="json"), order.row_id, {"booster": booster_str})
+            outbox_service.add(
+                session,
+                models.OutboxKind.SHEETS_UPDATE_ORDER,
+                {"parser": parser.model_dump(mode="json"), "row_id": order.row_id, "data": {"booster": booster_str}},
+                order_id=order.id,
+            )
 
 
 async def create(
@@ -91,6 +97,11 @@ async def create(
     if user_order.completed:
         user_order.completed_at = order.end_date if order.end_date else datetime.now(UTC)
     try:
+        if not user_order.completed and not await reserve_active_order(session, user):
+            raise errors.ApiHTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=[errors.ApiException(msg="You have reached the limit of active orders.", code="limit_reached")],
+            )
         session.add(user_order)
         total_dollars = sum([d.dollars for d in boosters])
         if total_dollars + price > order.price.booster_dollar_fee:
@@ -98,24 +109,24 @@ async def create(
             for booster in boosters:
                 booster.dollars = booster.dollars - price * price_map[booster.id]
             session.add_all(boosters)
-        await session.commit()
-        logger.info(f"Created UserOrder [order_id={user_order.order_id} user_id={user_order.user_id}]")
-    except Exception as e:
-        await session.rollback()
-        raise e
-    else:
         if not boosters:
             order_update = schemas.OrderUpdate(auth_date=datetime.now(UTC))
-            new_order = await order_service.update(session, order, order_update)
+            new_order = await order_service.update(session, order, order_update, commit=False)
             if sync:
                 await sheets_flows.order_to_sheets(
                     session,
                     new_order,
                     await order_flows.format_order_system(session, new_order),
                 )
-
         if sync:
             await sync_boosters_sheet(session, order)
+        # One commit for the booster, the order and the queued sheet updates
+        await session.commit()
+        order_service.invalidate_payloads(session, order.id)
+        logger.info(f"Created UserOrder [order_id={user_order.order_id} user_id={user_order.user_id}]")
+    except Exception as e:
+        await session.rollback()
+        raise e
     return user_order
 
 
@@ -124,7 +135,9 @@ async def delete_by_order_id(session: AsyncSession, order_id: int) -> None:
     for user_order in user_orders:
         logger.info(f"Deleted UserOrder [order_id={user_order.order_id} user_id={user_order.user_id}]")
         await session.delete(user_order)
+    await update_active_orders(session, [d.user_id for d in user_orders if not d.completed], -1)
     await session.commit()
+    order_service.invalidate_payloads(session, order_id)
 
 
 async def update(
@@ -159,6 +172,8 @@ async def update(
                     ],
                 )
         user_order = boosters_map[user.id]
+        if update_model.completed is not None and update_model.completed != user_order.completed:
+            await update_active_orders(session, [user.id], -1 if update_model.completed else 1)
         if update_model.completed is not None:
             if update_model.completed:
                 user_order.completed_at = datetime.now(UTC)
@@ -175,6 +190,7 @@ async def update(
         if sync:
             await sync_boosters_sheet(session, order)
         await session.commit()
+        order_service.invalidate_payloads(session, order.id)
         return user_order
     except Exception as e:
         await session.rollback()
@@ -196,35 +212,83 @@ async def delete(
             detail=[errors.ApiException(msg="The user is not a booster of this order", code="not_exist")],
         )
     await session.execute(sa.delete(models.UserOrder).where(models.UserOrder.id == to_delete.id))
-    await session.commit()
+    if not to_delete.completed:
+        await update_active_orders(session, [to_delete.user_id], -1)
     if sync:
         await sync_boosters_sheet(session, order)
+    await session.commit()
+    order_service.invalidate_payloads(session, order.id)
     logger.info(f"Deleted UserOrder [order_id={to_delete.order_id} user_id={to_delete.user_id}]")
     return to_delete
 
 
 async def check_user_total_orders(session: AsyncSession, user: models.User) -> bool:
     result = await session.execute(
-        sa.select(func.count(models.UserOrder.id)).where(
-            models.UserOrder.user_id == user.id,
+        sa.select(models.User.active_orders, models.User.max_orders).where(models.User.id == user.id)
+    )
+    active_orders, max_orders = result.one()
+    return bool(active_orders < max_orders)
+
+
+async def reserve_active_order(session: AsyncSession, user: models.User) -> bool:
+    # Conditional increment: the row lock taken by UPDATE serializes concurrent picks,
+    # so the limit can't be exceeded even if two requests passed the read-only check.
+    result = await session.execute(
+        sa.update(models.User)
+        .where(models.User.id == user.id, models.User.active_orders < models.User.max_orders)
+        .values(active_orders=models.User.active_orders + 1)
+        .returning(models.User.id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none() is not None
+
+
+async def update_active_orders(session: AsyncSession, users_id: typing.Iterable[int], delta: int) -> None:
+    users_id = set(users_id)
+    if not users_id:
+        return
+    await session.execute(
+        sa.update(models.User)
+        .where(models.User.id.in_(users_id))
+        .values(active_orders=func.greatest(models.User.active_orders + delta, 0))
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def recalculate_active_orders(session: AsyncSession) -> None:
+    active_orders = (
+        sa.select(func.count(models.UserOrder.id))
+        .where(
+            models.UserOrder.user_id == models.User.id,
             models.UserOrder.completed == False,  # noqa: E712
         )
+        .scalar_subquery()
+    )
+    await session.execute(
+        sa.update(models.User).values(active_orders=active_orders).execution_options(synchronize_session=False)
     )
-    count = result.one()
-    return bool(count[0] < user.max_orders)
+    await session.commit()
+
 
+async def update_booster_price(session: AsyncSession, order_id: int, old_dollars: float, new_dollars: float) -> None:
+    """Spread a change of the order ``booster_dollar_fee`` evenly over the boosters' ``dollars``.
 
-async def update_booster_price(session: AsyncSession, old: models.Order, new: models.Order) -> None:
-    boosters = await get_by_order_id(session, new.id)
-    if not boosters:
+    ``UserOrder.dollars`` is split from ``booster_dollar_fee`` when boosters are added, so the delta is
+    taken on that same column. It used to be taken on ``booster_dollar`` converted to RUB, which added
+    roubles to a dollar amount and ignored fee-only changes.
+    """
+    if old_dollars == new_dollars:
         return
-    old_price = await currency_flows.usd_to_currency(session, old.price.booster_dollar, old.date)
-    new_price = await currency_flows.usd_to_currency(session, new.price.booster_dollar, new.date)
-    delta = (new_price - old_price) / len(boosters)
-    for booster in boosters:
-        booster.dollars += delta
-    session.add_all(boosters)
-    await session.commit()
+    total = await session.scalar(sa.select(func.count(models.UserOrder.id)).where(models.UserOrder.order_id == order_id))
+    if not total:
+        return
+    delta = (new_dollars - old_dollars) / total
+    await session.execute(
+        sa.update(models.UserOrder)
+        .where(models.UserOrder.order_id == order_id)
+        .values(dollars=models.UserOrder.dollars + delta)
+        .execution_options(synchronize_session=False)
+    )
 
 
 def boosters_from_str(string: str) -> dict[str, int | None]:
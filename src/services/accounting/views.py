@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 
 from src import schemas
 from src.core import db, enums, pagination
@@ -83,4 +84,4 @@ async def get_active_orders(
     session=Depends(db.get_async_session),
 ):
     user = await auth_flows.get(session, user_id)
-    return await flows.get_by_filter(session, user, params)
+    return ORJSONResponse(await flows.get_by_filter(session, user, params))
@@ -1,13 +1,14 @@
 import sqlalchemy as sa
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 from sqlalchemy.sql.functions import count
 
 from src import models, schemas
-from src.core import db, enums, pagination
+from src.core import counting, db, enums, http, pagination
 from src.services.auth import flows as auth_flows
 from src.services.auth import service as auth_service
+from src.services.auth import utils as auth_utils
 from src.services.integrations.notifications import flows as notifications_flows
 from src.services.integrations.sheets import flows as sheets_flows
 from src.services.order import flows as orders_flows
@@ -28,12 +29,13 @@ async def get_users(
     query = sa.select(models.User).offset(params.offset).limit(params.limit).order_by(params.order_by)
     result = await session.execute(query)
     results = [schemas.UserRead.model_validate(user) for user in result.scalars()]
-    total = await session.execute(sa.select(count(models.User.id)))
+    total, estimated = await counting.count(session, sa.select(count(models.User.id)), estimate=True)
     return pagination.Paginated(
         page=params.page,
         per_page=params.per_page,
-        total=total.one()[0],
+        total=total,
         results=results,
+        estimated=estimated,
     )
 
 
@@ -70,7 +72,7 @@ async def verify_user(user_id: int, session=Depends(db.get_async_session)):
     user = await auth_flows.get(session, user_id)
     updated_user = await auth_service.verify(session, user)
     updated_user_read = schemas.UserRead.model_validate(updated_user)
-    notifications_flows.send_verified_notify(await notifications_flows.get_user_accounts(session, updated_user_read))
+    await notifications_flows.send_verified_notify(await notifications_flows.get_user_accounts(session, updated_user_read))
     await sheets_flows.create_or_update_user(session, updated_user)
     return updated_user_read
 
@@ -121,27 +123,24 @@ async def get_payrolls(
     return await payroll_service.get_by_filter(session, user, params)
 
 
+@router.post(path="/orders/search", response_model=pagination.Paginated[schemas.OrderReadSystem])
+async def search_orders(params: schemas.OrderSearchParams, session=Depends(db.get_async_session)):
+    return await orders_flows.search(session, params)
+
+
 @router.post(
     path="/orders/filter",
     response_model=pagination.Paginated[schemas.OrderReadSystem],
 )
 async def get_orders(params: schemas.OrderFilterParams, session=Depends(db.get_async_session)):
-    query = sa.select(models.Order).options(
-        joinedload(models.Order.info),
-        joinedload(models.Order.price),
-        joinedload(models.Order.credentials),
-        joinedload(models.Order.screenshots),
-    )
+    return ORJSONResponse(await orders_flows.get_by_filter(session, params, schemas.OrderReadSystem))
 
-    query = params.apply_filters(query)
-    query = params.apply_pagination(query)
-    result = await session.execute(query)
-    results = [await orders_flows.format_order_system(session, order) for order in result.unique().scalars()]
-    count_query = params.apply_filters(sa.select(count(models.Order.id)))
-    total = await session.execute(count_query)
-    return pagination.Paginated(
-        page=params.page,
-        per_page=params.per_page,
-        total=total.one()[0],
-        results=results,
-    )
+
+@router.get(path="/integrations/metrics", response_model=dict[str, schemas.IntegrationClientMetrics])
+async def get_integration_metrics():
+    return http.metrics()
+
+
+@router.get(path="/auth/hashing/metrics", response_model=schemas.PasswordHashingMetrics)
+async def get_password_hashing_metrics():
+    return auth_utils.hashing_stats()
@@ -1,15 +1,17 @@
+import hashlib
 import secrets
 
 import jwt
 import sqlalchemy as sa
+from cashews import cache
 from fastapi.security import OAuth2PasswordRequestForm
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, make_transient_to_detached
 from starlette import status
 
 from src import models, schemas
-from src.core import config, errors
+from src.core import config, counting, errors
 from src.utils import jwt as jwt_utils
 
 from . import utils
@@ -39,6 +41,50 @@ async def get_all(session: AsyncSession) -> list[models.User]:
     return result.all()  # type: ignore
 
 
+# Never cached; a principal served from the cache leaves these attributes unloaded
+_PRINCIPAL_EXCLUDE = frozenset({"hashed_password"})
+
+
+def _principal_key(user_id: int) -> str:
+    return f"principal:{user_id}"
+
+
+def _api_token_key(token: str) -> str:
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    return f"principal_api_token:{counting.TABLE_VERSIONS[models.AccessTokenAPI.__tablename__]}:{digest}"
+
+
+async def _cache_principal(user: models.User) -> None:
+    data = {
+        attr.key: getattr(user, attr.key)
+        for attr in sa.inspect(models.User).column_attrs
+        if attr.key not in _PRINCIPAL_EXCLUDE
+    }
+    await cache.set(_principal_key(user.id), data, expire=config.app.principal_cache_ttl)
+
+
+async def get_principal(session: AsyncSession, user_id: int) -> models.User | None:
+    """``get`` for authentication, served from a short-TTL cache without a round trip.
+
+    A cached user is attached to ``session`` as a persistent instance without a ``SELECT``.
+    ``update`` and ``delete`` drop the entry; other writes to the user row (e.g. ``active_orders``)
+    show up once ``principal_cache_ttl`` expires.
+    """
+    data = await cache.get(_principal_key(user_id))
+    if data is None:
+        user = await get(session, user_id)
+        if user is not None:
+            await _cache_principal(user)
+        return user
+    user = models.User(**data)
+    make_transient_to_detached(user)
+    return await session.merge(user, load=False)
+
+
+async def invalidate_principal(user_id: int) -> None:
+    await cache.delete(_principal_key(user_id))
+
+
 async def get_first_superuser(session: AsyncSession) -> models.User:
     return await get_by_email(session, config.app.super_user_email)  # type: ignore
 
@@ -63,7 +109,7 @@ async def create(session: AsyncSession, user_create: schemas.UserCreate, safe: b
     user_dict = user_create.model_dump(exclude=exclude_fields, exclude_unset=True)
     email: str = user_dict.pop("email")
     password = user_dict.pop("password")
-    user_dict["hashed_password"] = utils.hash_password(password)
+    user_dict["hashed_password"] = await utils.hash_password(password)
     user_dict["email"] = email.lower()
     created_user = models.User(**user_dict)
     session.add(created_user)
@@ -90,11 +136,12 @@ async def update(
     )
 
     if user_in.password:
-        user.hashed_password = utils.hash_password(user_in.password)
+        user.hashed_password = await utils.hash_password(user_in.password)
     query = sa.update(models.User).where(models.User.id == user.id).values(**update_data).returning(models.User)
     result = await session.scalars(query)
     user = result.one()
     await session.commit()
+    await invalidate_principal(user.id)
     return user
 
 
@@ -102,6 +149,7 @@ async def delete(session: AsyncSession, user: models.User) -> None:
     query = sa.delete(models.User).where(models.User.id == user.id)
     await session.execute(query)
     await session.commit()
+    await invalidate_principal(user.id)
 
 
 async def request_verify_email(session: AsyncSession, user: models.User) -> None:
@@ -165,10 +213,10 @@ async def verify_email(session: AsyncSession, token: str) -> models.User:
 async def authenticate(session: AsyncSession, credentials: OAuth2PasswordRequestForm) -> models.User | None:
     user = await get_by_email(session, credentials.username.lower())
     if user is None:
-        utils.hash_password(credentials.password)
+        await utils.hash_password(credentials.password)
         return None
 
-    verified, updated_password_hash = utils.verify_and_update_password(credentials.password, user.hashed_password)
+    verified, updated_password_hash = await utils.verify_and_update_password(credentials.password, user.hashed_password)
     if not verified:
         return None
     if updated_password_hash is not None:
@@ -184,7 +232,7 @@ async def forgot_password(user: models.User) -> None:
 
     token_data = {
         "sub": user.id,
-        "password_fingerprint": utils.hash_password(user.hashed_password),
+        "password_fingerprint": await utils.hash_password(user.hashed_password),
         "aud": config.app.reset_password_token_audience,
     }
     token = jwt_utils.generate_jwt(token_data, config.app.reset_password_secret, 900)
@@ -218,7 +266,7 @@ async def reset_password(session: AsyncSession, token: str, password: str) -> mo
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=[errors.ApiException(msg="RESET_PASSWORD_BAD_TOKEN", code="RESET_PASSWORD_BAD_TOKEN")],
         )
-    valid_password_fingerprint, _ = utils.verify_and_update_password(user.hashed_password, password_fingerprint)
+    valid_password_fingerprint, _ = await utils.verify_and_update_password(user.hashed_password, password_fingerprint)
     logger.warning(f"Try reset password for user, password validation = {valid_password_fingerprint}")
     if not valid_password_fingerprint:
         e = errors.ApiException(
@@ -248,9 +296,7 @@ async def verify_access_token(session: AsyncSession, token: str | None) -> model
     except jwt.PyJWTError:
         return None
 
-    query = (sa.select(models.User).where(models.User.id == user["id"])).limit(1)
-    result = await session.scalars(query)
-    return result.first()
+    return await get_principal(session, user["id"])
 
 
 async def verify(session: AsyncSession, user: models.User) -> models.User:
@@ -269,6 +315,10 @@ async def verify(session: AsyncSession, user: models.User) -> models.User:
     return updated_user
 
 
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 async def refresh_tokens(session: AsyncSession, token: str | None) -> tuple[str, str]:
     if token is None:
         raise errors.ApiHTTPException(
@@ -288,30 +338,29 @@ async def refresh_tokens(session: AsyncSession, token: str | None) -> tuple[str,
             detail=[errors.ApiException(msg="INVALID_REFRESH_TOKEN", code="INVALID_REFRESH_TOKEN")],
         ) from e
 
+    # Consuming the token in the same statement that finds it keeps a token from being used twice
     query = (
-        sa.select(models.RefreshToken)
+        sa.delete(models.RefreshToken)
         .where(
+            models.RefreshToken.token_hash == hash_refresh_token(token),
             models.RefreshToken.user_id == user["id"],
-            models.RefreshToken.token == token,
         )
-        .limit(1)
+        .returning(models.RefreshToken.id)
     )
-    result = await session.scalars(query)
-    refresh_token = result.first()
-    if refresh_token is None:
+    result = await session.execute(query)
+    if result.scalar_one_or_none() is None:
         raise errors.ApiHTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=[errors.ApiException(msg="INVALID_REFRESH_TOKEN", code="INVALID_REFRESH_TOKEN")],
         )
 
-    query = (sa.select(models.User).where(models.User.id == user["id"])).limit(1)
-    result = await session.scalars(query)
-    user = result.first()
-    tokens = await create_access_token(session, user)
-    query = sa.delete(models.RefreshToken).where(models.RefreshToken.token == token)
-    await session.execute(query)
-    await session.commit()
-    return tokens
+    user = await get(session, user["id"])
+    if user is None:
+        raise errors.ApiHTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=[errors.ApiException(msg="INVALID_REFRESH_TOKEN", code="INVALID_REFRESH_TOKEN")],
+        )
+    return await create_access_token(session, user)
 
 
 async def create_access_token(session: AsyncSession, user: models.User) -> tuple[str, str]:
@@ -320,8 +369,10 @@ async def create_access_token(session: AsyncSession, user: models.User) -> tuple
         "aud": config.app.access_token_audience,
     }
     access_token = jwt_utils.generate_jwt(token_data, config.app.access_token_secret, 24 * 3600 * 7)
-    refresh_token = jwt_utils.generate_jwt(token_data, config.app.refresh_token_secret, 24 * 3600 * 30)
-    query = sa.insert(models.RefreshToken).values(token=refresh_token, user_id=user.id)
+    refresh_token = jwt_utils.generate_jwt(
+        token_data, config.app.refresh_token_secret, config.app.refresh_token_expires_s
+    )
+    query = sa.insert(models.RefreshToken).values(token_hash=hash_refresh_token(refresh_token), user_id=user.id)
     await session.execute(query)
     await session.commit()
     return access_token, refresh_token
@@ -330,6 +381,10 @@ async def create_access_token(session: AsyncSession, user: models.User) -> tuple
 async def read_token_api(session: AsyncSession, token: str | None) -> models.User | None:
     if token is None:
         return None
+    key = _api_token_key(token)
+    user_id = await cache.get(key)
+    if user_id is not None:
+        return await get_principal(session, user_id)
     query = (
         sa.select(models.AccessTokenAPI)
         .where(models.AccessTokenAPI.token == token)
@@ -340,6 +395,8 @@ async def read_token_api(session: AsyncSession, token: str | None) -> models.Use
     access_token = result.first()
     if access_token is None:
         return None
+    await cache.set(key, access_token.user_id, expire=config.app.principal_cache_ttl)
+    await _cache_principal(access_token.user)
     return access_token.user
 
 
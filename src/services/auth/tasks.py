@@ -1,14 +1,29 @@
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import delete
+import sqlalchemy as sa
+from loguru import logger
 
 from src import models
-from src.core import db
+from src.core import config, db
 
 
 async def remove_expired_tokens():
-    async with db.session_maker() as session:
-        await session.execute(
-            delete(models.RefreshToken).where(models.RefreshToken.created_at < datetime.now(UTC) - timedelta(days=30))
-        )
-        await session.commit()
+    """Delete expired refresh tokens in batches of ``refresh_token_cleanup_batch``, one transaction each."""
+    expired_at = datetime.now(UTC) - timedelta(seconds=config.app.refresh_token_expires_s)
+    batch = (
+        sa.select(models.RefreshToken.id)
+        .where(models.RefreshToken.created_at < expired_at)
+        .limit(config.app.refresh_token_cleanup_batch)
+        .with_for_update(skip_locked=True)
+    )
+    query = sa.delete(models.RefreshToken).where(models.RefreshToken.id.in_(batch.scalar_subquery()))
+    total = 0
+    async with db.async_session_maker() as session:
+        while True:
+            result = await session.execute(query)
+            await session.commit()
+            total += result.rowcount
+            if result.rowcount < config.app.refresh_token_cleanup_batch:
+                break
+    if total:
+        logger.info(f"Removed {total} expired refresh tokens")
@@ -1,16 +1,59 @@
+import asyncio
+import time
+import typing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib import pwd
 from passlib.context import CryptContext
 
+from src.core import config
 
 password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop without a process pool.
+# The pool is bounded: a burst of logins queues here instead of freezing every other request.
+_executor = ThreadPoolExecutor(max_workers=config.app.password_hash_workers, thread_name_prefix="password-hash")
+_queue_times: deque[float] = deque(maxlen=1000)
+_stats = {"calls": 0, "pending": 0}
+
+T = typing.TypeVar("T")
+
+
+async def _run(func: typing.Callable[..., T], *args: typing.Any) -> T:
+    submitted = time.perf_counter()
+
+    def job() -> tuple[float, T]:
+        return time.perf_counter() - submitted, func(*args)
+
+    _stats["pending"] += 1
+    try:
+        queued, result = await asyncio.get_running_loop().run_in_executor(_executor, job)
+    finally:
+        _stats["pending"] -= 1
+    _stats["calls"] += 1
+    _queue_times.append(queued)
+    return result
+
+
+def hashing_stats() -> dict[str, typing.Any]:
+    ordered = sorted(_queue_times)
+    return {
+        "workers": config.app.password_hash_workers,
+        "calls": _stats["calls"],
+        "pending": _stats["pending"],
+        "queue_ms_p50": round(ordered[len(ordered) // 2] * 1000, 2) if ordered else None,
+        "queue_ms_p95": round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] * 1000, 2) if ordered else None,
+        "queue_ms_max": round(ordered[-1] * 1000, 2) if ordered else None,
+    }
+
 
-def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
-    return password_context.verify_and_update(plain_password, hashed_password)
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await _run(password_context.verify_and_update, plain_password, hashed_password)
 
 
-def hash_password(password: str) -> str:
-    return password_context.hash(password)
+async def hash_password(password: str) -> str:
+    return await _run(password_context.hash, password)
 
 
 def generate_password() -> str:
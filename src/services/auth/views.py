@@ -33,7 +33,7 @@ async def login(
         )
     token = await service.create_access_token(session, user)
     user_read = schemas.UserRead.model_validate(user, from_attributes=True)
-    notifications_flows.send_logged_notify(
+    await notifications_flows.send_logged_notify(
         await notifications_flows.get_user_accounts(session, user_read),
         integration,
     )
@@ -50,7 +50,7 @@ async def register(
     created_user = await service.create(session, user_create, safe=True)
     user = schemas.UserRead.model_validate(created_user)
     logger.info(f"User [email={user.email} name={user.name}] has registered.")
-    notifications_flows.send_registered_notify(await notifications_flows.get_user_accounts(session, user), integration)
+    await notifications_flows.send_registered_notify(await notifications_flows.get_user_accounts(session, user), integration)
     parser = await sheets_service.get_default_booster_read(session)
     tasks_service.create_user.delay(parser.model_dump(mode="json"), user.model_dump())
     return user
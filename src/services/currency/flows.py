@@ -1,4 +1,5 @@
-from datetime import datetime
+import typing
+from datetime import date, datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -16,6 +17,15 @@ async def get(session: AsyncSession, currency_date: datetime) -> models.Currency
     return currency
 
 
+async def get_many(session: AsyncSession, dates: typing.Iterable[datetime]) -> dict[date, models.Currency]:
+    dates = list(dates)
+    currencies = await service.get_by_dates(session, dates)
+    for currency_date in dates:
+        if currency_date.date() not in currencies:
+            currencies[currency_date.date()] = await get(session, currency_date)
+    return currencies
+
+
 async def usd_to_currency(
     session: AsyncSession,
     dollars: float,
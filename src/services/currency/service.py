@@ -1,4 +1,5 @@
-from datetime import UTC, datetime
+import typing
+from datetime import UTC, date, datetime
 
 import httpx
 import sqlalchemy as sa
@@ -62,6 +63,14 @@ async def get_by_date(session: AsyncSession, date: datetime) -> models.Currency
     return currency
 
 
+async def get_by_dates(session: AsyncSession, dates: typing.Iterable[datetime]) -> dict[date, models.Currency]:
+    days = {datetime(year=d.year, month=d.month, day=d.day) for d in dates}
+    if not days:
+        return {}
+    result = await session.scalars(sa.select(models.Currency).where(models.Currency.date.in_(days)))
+    return {currency.date.date(): currency for currency in result.all()}
+
+
 async def get_all(session: AsyncSession) -> list[models.Currency]:
     result = await session.scalars(sa.select(models.Currency))
     currencies = result.all()
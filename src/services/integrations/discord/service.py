@@ -4,12 +4,16 @@ from httpx import ConnectError, HTTPError, TimeoutException
 from loguru import logger
 from pydantic import BaseModel
 
-from src.core import config, errors
+from src.core import config, errors, http
 
-discord_client = httpx.AsyncClient(
-    verify=False,
-    base_url=config.app.discord_url,
-    headers={"Authorization": "Bearer " + config.app.discord_token},
+discord_client = http.register(
+    http.IntegrationClient(
+        "discord",
+        config.app.discord_url,
+        {"Authorization": "Bearer " + config.app.discord_token},
+        endpoint_timeouts=config.app.bot_endpoint_timeouts,
+        verify=False,
+    )
 )
 
 
@@ -24,13 +28,11 @@ error = errors.ApiHTTPException(
 )
 
 
-async def request(endpoint: str, method: str, data: dict | list | BaseModel | None = None) -> httpx.Response:
+async def request(
+    endpoint: str, method: str, data: dict | list | BaseModel | None = None, *, rate_key: int | None = None
+) -> httpx.Response:
     try:
-        response = await discord_client.request(
-            method=method,
-            url=f"api/{endpoint}",
-            json=jsonable_encoder(data),
-        )
+        response = await discord_client.request(method, endpoint, rate_key=rate_key, json=jsonable_encoder(data))
         if response.status_code not in (200, 201, 404):
             logger.error(response.json())
             raise error from None
@@ -1,12 +1,15 @@
+import asyncio
 from datetime import datetime
 
 import httpx
 import pytz
 import sqlalchemy as sa
+from cashews import cache
+from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import models, schemas
-from src.core import enums, pagination
+from src.core import config, counting, enums, errors, pagination
 from src.services.integrations.channel import service as channel_service
 from src.services.integrations.discord import service as discord_service
 from src.services.integrations.render import flows as render_flows
@@ -47,15 +50,90 @@ async def get_message_by_order_id_user_id(
     return result.scalars().first()
 
 
-async def request(integration: enums.Integration, path: str, method: str, data: dict | None = None) -> httpx.Response:
+async def request(
+    integration: enums.Integration, path: str, method: str, data: dict | None = None, *, rate_key: int | None = None
+) -> httpx.Response:
+    """Send a bot request; ``rate_key`` is the channel or user the message goes to, for per-chat rate limits."""
     if integration == enums.Integration.discord:
-        return await discord_service.request(path, method, data)
+        return await discord_service.request(path, method, data, rate_key=rate_key)
     elif integration == enums.Integration.telegram:
-        return await telegram_service.request(path, method, data)
+        return await telegram_service.request(path, method, data, rate_key=rate_key)
     else:
         raise ValueError("Invalid integration")
 
 
+_fan_out_limits: dict[enums.Integration, asyncio.Semaphore] = {}
+
+
+async def _send(
+    integration: enums.Integration, channels_id: list[int], path: str, method: str, payload: dict
+) -> schemas.MessageCallback:
+    limit = _fan_out_limits.setdefault(integration, asyncio.Semaphore(config.app.message_fan_out_concurrency))
+    async with limit:
+        try:
+            rate_key = channels_id[0] if len(channels_id) == 1 else None
+            response = await request(integration, path, method, data=payload, rate_key=rate_key)
+            return schemas.MessageCallback.model_validate(response.json())
+        except (errors.ApiHTTPException, httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Bot request failed [integration={integration} channels_id={channels_id} path={path}]: {e}")
+            return schemas.MessageCallback(
+                skipped=[
+                    schemas.SkippedCallback(channel_id=channel_id, status=models.CallbackStatus.FAILED)
+                    for channel_id in channels_id
+                ]
+            )
+
+
+async def fan_out(
+    integration: enums.Integration, path: str, method: str, payloads: list[tuple[int, dict]]
+) -> list[schemas.MessageCallback]:
+    """Send one bot request per ``(channel_id, payload)`` concurrently, bounded per integration.
+
+    A failed request is reported as a ``FAILED`` skip for its channel instead of aborting the batch.
+    Results are in the order of ``payloads``.
+    """
+    return await asyncio.gather(
+        *(_send(integration, [channel_id], path, method, payload) for channel_id, payload in payloads)
+    )
+
+
+@cache.cache(ttl=300, key="bot_capabilities_{integration}")
+async def get_capabilities(integration: enums.Integration) -> dict:
+    """Features the bot reports; raises when it can't be asked, so only real answers are cached."""
+    response = await request(integration, "capabilities", "GET")
+    if response.status_code == 404:
+        return {}
+    return response.json()
+
+
+async def supports_bulk(integration: enums.Integration, feature: str = "bulk_messages") -> bool:
+    try:
+        capabilities = await get_capabilities(integration)
+    except (errors.ApiHTTPException, ValueError) as e:
+        logger.warning(f"Bot capabilities are unavailable [integration={integration}]: {e}")
+        return False
+    return bool(capabilities.get(feature, False))
+
+
+async def dispatch(
+    integration: enums.Integration,
+    path: str,
+    method: str,
+    payloads: list[tuple[int, dict]],
+    bulk_payload: dict,
+) -> list[schemas.MessageCallback]:
+    """Send the payloads as one ``{path}/bulk`` request if the bot supports it, else fan out per channel.
+
+    ``bulk_payload`` carries what is shared (e.g. the text) once, plus the channels or messages.
+    """
+    if not payloads:
+        return []
+    if await supports_bulk(integration):
+        channels_id = [channel_id for channel_id, _ in payloads]
+        return [await _send(integration, channels_id, f"{path}/bulk", method, bulk_payload)]
+    return await fan_out(integration, path, method, payloads)
+
+
 async def create_order_message(
     session: AsyncSession,
     order: schemas.OrderReadSystem | schemas.PreOrderReadSystem,
@@ -72,6 +150,7 @@ async def create_order_message(
         return schemas.MessageCallback(error=True, error_msg=text)
     created, skipped = [], []
     existing_channels = [msg.channel_id for msg in messages]
+    payloads = []
     for channel_id in [ch.channel_id for ch in chs]:
         if channel_id in existing_channels:
             skipped.append(schemas.SkippedCallback(channel_id=channel_id, status=models.CallbackStatus.EXISTS))
@@ -82,8 +161,14 @@ async def create_order_message(
             "text": text,
             "is_preorder": data.is_preorder,
         }
-        response = await request(data.integration, "message/order", "POST", data=payload)
-        response_data = schemas.MessageCallback.model_validate(response.json())
+        payloads.append((channel_id, payload))
+    bulk_payload = {
+        "channels_id": [channel_id for channel_id, _ in payloads],
+        "order_id": data.order_id,
+        "text": text,
+        "is_preorder": data.is_preorder,
+    }
+    for response_data in await dispatch(data.integration, "message/order", "POST", payloads, bulk_payload):
         for created_msg in response_data.created:
             message_db = models.OrderMessage(
                 order_id=data.order_id,
@@ -107,22 +192,23 @@ async def update_order_message(
 ) -> schemas.MessageCallback:
     messages = await get_messages_by_order_id(session, data.integration, data.order_id, data.is_preorder)
     updated, skipped = [], []
-    for message in messages:
-        status, text = await render_flows.generate_body(
-            session, data.integration, order, data.configs, data.is_preorder, data.is_gold
-        )
-        if not status:
-            return schemas.MessageCallback(error=True, error_msg=text)
-        payload = {
-            "message": schemas.OrderMessageRead.model_validate(message, from_attributes=True),
-            "text": text,
-        }
-        response = await request(message.integration, "message/order", "PATCH", data=payload)
-        response_data = schemas.MessageCallback.model_validate(response.json())
-        if response_data.updated:
-            message.updated_at = datetime.now(pytz.utc)
-            session.add(message)
+    if not messages:
+        return schemas.MessageCallback(updated=updated, skipped=skipped)
+    status, text = await render_flows.generate_body(
+        session, data.integration, order, data.configs, data.is_preorder, data.is_gold
+    )
+    if not status:
+        return schemas.MessageCallback(error=True, error_msg=text)
+    messages_read = [schemas.OrderMessageRead.model_validate(message, from_attributes=True) for message in messages]
+    payloads = [(message.channel_id, {"message": message, "text": text}) for message in messages_read]
+    bulk_payload = {"messages": messages_read, "text": text}
+    channel_messages = {message.channel_id: message for message in messages}
+    for response_data in await dispatch(data.integration, "message/order", "PATCH", payloads, bulk_payload):
         for updated_msg in response_data.updated:
+            message = channel_messages.get(updated_msg.channel_id)
+            if message is not None:
+                message.updated_at = datetime.now(pytz.utc)
+                session.add(message)
             updated.append(updated_msg)
         for skipped_msg in response_data.skipped:
             skipped.append(skipped_msg)
@@ -136,18 +222,21 @@ async def delete_order_message(
 ) -> schemas.MessageCallback:
     messages = await get_messages_by_order_id(session, data.integration, data.order_id, data.is_preorder)
     deleted, skipped = [], []
-    for message in messages:
-        payload = {
-            "message": schemas.OrderMessageRead.model_validate(message, from_attributes=True),
-        }
-        response = await request(message.integration, "message/order", "DELETE", data=payload)
-        response_data = schemas.MessageCallback.model_validate(response.json())
+    messages_read = [schemas.OrderMessageRead.model_validate(message, from_attributes=True) for message in messages]
+    payloads = [(message.channel_id, {"message": message}) for message in messages_read]
+    channel_messages = {message.channel_id: message for message in messages}
+    for response_data in await dispatch(
+        data.integration, "message/order", "DELETE", payloads, {"messages": messages_read}
+    ):
         for deleted_msg in response_data.deleted:
-            await session.delete(message)
             deleted.append(deleted_msg)
+            if deleted_msg.channel_id in channel_messages:
+                await session.delete(channel_messages.pop(deleted_msg.channel_id))
         for skipped_msg in response_data.skipped:
             skipped.append(skipped_msg)
-            await session.delete(message)
+            # Keep the message when the bot could not be reached, so the delete can be retried
+            if skipped_msg.status != models.CallbackStatus.FAILED and skipped_msg.channel_id in channel_messages:
+                await session.delete(channel_messages.pop(skipped_msg.channel_id))
     await session.commit()
     return schemas.MessageCallback(deleted=deleted, skipped=skipped)
 
@@ -209,7 +298,7 @@ async def create_user_message(session: AsyncSession, data: schemas.CreateUserMes
         "user_id": data.user_id,
         "text": data.text,
     }
-    response = await request(data.integration, "message/user", "POST", data=payload)
+    response = await request(data.integration, "message/user", "POST", data=payload, rate_key=data.user_id)
     response_data = schemas.MessageCallback.model_validate(response.json())
     created, skipped = [], []
     for created_msg in response_data.created:
@@ -233,7 +322,7 @@ async def update_user_message(session: AsyncSession, data: schemas.UpdateUserMes
         "message": schemas.UserMessageRead.model_validate(message, from_attributes=True),
         "text": data.text,
     }
-    response = await request(data.integration, "message/user", "PATCH", data=payload)
+    response = await request(data.integration, "message/user", "PATCH", data=payload, rate_key=message.user_id)
     response_data = schemas.MessageCallback.model_validate(response.json())
     updated, skipped = [], []
     for updated_msg in response_data.updated:
@@ -251,7 +340,7 @@ async def delete_user_message(session: AsyncSession, data: schemas.DeleteUserMes
     payload = {
         "message": schemas.UserMessageRead.model_validate(message, from_attributes=True),
     }
-    response = await request(data.integration, "message/user", "DELETE", data=payload)
+    response = await request(data.integration, "message/user", "DELETE", data=payload, rate_key=message.user_id)
     response_data = schemas.MessageCallback.model_validate(response.json())
     deleted, skipped = [], []
     for deleted_msg in response_data.deleted:
@@ -271,30 +360,51 @@ async def get_order_messages_by_filter(
     query = params.apply_filter(query)
     query = params.apply_pagination(query)
     result = await session.execute(query)
-    results = [schemas.OrderMessageRead.model_validate(row, from_attributes=True) for row in result.scalars()]
-    total = await session.scalars(params.apply_filter(sa.select(sa.func.count(models.Message.id))))
-    return pagination.Paginated(results=results, total=total.one(), page=params.page, per_page=params.per_page)
+    messages = result.scalars().all()
+    results = [schemas.OrderMessageRead.model_validate(row, from_attributes=True) for row in messages]
+    total, _ = await counting.count(session, params.apply_filter(sa.select(sa.func.count(models.OrderMessage.id))))
+    return pagination.Paginated(
+        results=results,
+        total=total,
+        page=params.page,
+        per_page=params.per_page,
+        next_cursor=params.next_cursor(messages),
+    )
 
 
 async def get_user_messages_by_filter(
     session: AsyncSession, params: schemas.UserMessagePaginationParams
 ) -> pagination.Paginated[schemas.UserMessageRead]:
-    query = sa.select(models.OrderMessage)
+    query = sa.select(models.UserMessage)
     query = params.apply_filter(query)
     query = params.apply_pagination(query)
     result = await session.execute(query)
-    results = [schemas.UserMessageRead.model_validate(row, from_attributes=True) for row in result.scalars()]
-    total = await session.scalars(params.apply_filter(sa.select(sa.func.count(models.Message.id))))
-    return pagination.Paginated(results=results, total=total.one(), page=params.page, per_page=params.per_page)
+    messages = result.scalars().all()
+    results = [schemas.UserMessageRead.model_validate(row, from_attributes=True) for row in messages]
+    total, _ = await counting.count(session, params.apply_filter(sa.select(sa.func.count(models.UserMessage.id))))
+    return pagination.Paginated(
+        results=results,
+        total=total,
+        page=params.page,
+        per_page=params.per_page,
+        next_cursor=params.next_cursor(messages),
+    )
 
 
 async def get_response_messages_by_filter(
     session: AsyncSession, params: schemas.ResponseMessagePaginationParams
 ) -> pagination.Paginated[schemas.ResponseMessageRead]:
-    query = sa.select(models.OrderMessage)
+    query = sa.select(models.ResponseMessage)
     query = params.apply_filter(query)
     query = params.apply_pagination(query)
     result = await session.execute(query)
-    results = [schemas.ResponseMessageRead.model_validate(row, from_attributes=True) for row in result.scalars()]
-    total = await session.scalars(params.apply_filter(sa.select(sa.func.count(models.Message.id))))
-    return pagination.Paginated(results=results, total=total.one(), page=params.page, per_page=params.per_page)
+    messages = result.scalars().all()
+    results = [schemas.ResponseMessageRead.model_validate(row, from_attributes=True) for row in messages]
+    total, _ = await counting.count(session, params.apply_filter(sa.select(sa.func.count(models.ResponseMessage.id))))
+    return pagination.Paginated(
+        results=results,
+        total=total,
+        page=params.page,
+        per_page=params.per_page,
+        next_cursor=params.next_cursor(messages),
+    )
@@ -32,12 +32,12 @@ async def create_order_message(data: schemas.CreateOrderMessage, session=Depends
         preorder = await preorder_flows.get(session, data.order_id)
         preorder_read = await preorder_flows.format_preorder_system(session, preorder)
         resp = await service.create_order_message(session, preorder_read, data)
-        notifications_flows.send_sent_order_notify(preorder.order_id, data.integration, resp)
+        await notifications_flows.send_sent_order_notify(preorder.order_id, data.integration, resp)
     else:
         order = await order_flows.get(session, data.order_id)
         order_read = await order_flows.format_order_system(session, order)
         resp = await service.create_order_message(session, order_read, data)
-        notifications_flows.send_sent_order_notify(order.order_id, data.integration, resp)
+        await notifications_flows.send_sent_order_notify(order.order_id, data.integration, resp)
     return resp
 
 
@@ -46,11 +46,11 @@ async def delete_order_message(data: schemas.DeleteOrderMessage, session=Depends
     if data.is_preorder:
         preorder = await preorder_flows.get(session, data.order_id)
         resp = await service.delete_order_message(session, data)
-        notifications_flows.send_deleted_order_notify(preorder.order_id, data.integration, resp)
+        await notifications_flows.send_deleted_order_notify(preorder.order_id, data.integration, resp)
     else:
         order = await order_flows.get(session, data.order_id)
         resp = await service.delete_order_message(session, data)
-        notifications_flows.send_deleted_order_notify(order.order_id, data.integration, resp)
+        await notifications_flows.send_deleted_order_notify(order.order_id, data.integration, resp)
     return resp
 
 
@@ -60,12 +60,12 @@ async def update_order_message(data: schemas.UpdateOrderMessage, session=Depends
         preorder = await preorder_flows.get(session, data.order_id)
         preorder_read = await preorder_flows.format_preorder_system(session, preorder)
         resp = await service.update_order_message(session, preorder_read, data)
-        notifications_flows.send_edited_order_notify(preorder.order_id, data.integration, resp)
+        await notifications_flows.send_edited_order_notify(preorder.order_id, data.integration, resp)
     else:
         order = await order_flows.get(session, data.order_id)
         order_read = await order_flows.format_order_system(session, order)
         resp = await service.update_order_message(session, order_read, data)
-        notifications_flows.send_edited_order_notify(order.order_id, data.integration, resp)
+        await notifications_flows.send_edited_order_notify(order.order_id, data.integration, resp)
     return resp
 
 
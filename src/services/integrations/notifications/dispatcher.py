@@ -0,0 +1,156 @@
+import asyncio
+import datetime
+import typing
+
+from loguru import logger
+
+from src import schemas
+from src.core import config
+
+Notification = schemas.NotificationSendUser | schemas.NotificationSendSystem
+Handler = typing.Callable[[list[Notification]], typing.Awaitable[None]]
+Summarizer = typing.Callable[[list[Notification], datetime.datetime], Notification]
+
+
+class NotificationDispatcher:
+    """Bounded in-process queue drained by a fixed pool of workers.
+
+    Each worker takes whatever is queued (up to ``batch_size``) and hands it to ``handler`` as one batch.
+    Workers start lazily on the first ``submit`` in the running loop; ``drain`` waits for queued
+    notifications on shutdown.
+
+    A full queue slows producers down instead of losing notifications: ``submit`` waits up to
+    ``put_timeout`` seconds for room and then sends the notification itself.
+    """
+
+    def __init__(self, handler: Handler, *, size: int, workers: int, batch_size: int, put_timeout: float) -> None:
+        self.handler = handler
+        self.size = size
+        self.workers_count = workers
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self.waited = 0
+        self.overflowed = 0
+        self._queue: asyncio.Queue[Notification] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _start(self) -> asyncio.Queue[Notification]:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.size)
+            self._workers = [loop.create_task(self._work()) for _ in range(self.workers_count)]
+        return self._queue
+
+    async def submit(self, notification: Notification) -> None:
+        queue = self._start()
+        try:
+            queue.put_nowait(notification)
+            return
+        except asyncio.QueueFull:
+            self.waited += 1
+        try:
+            await asyncio.wait_for(queue.put(notification), self.put_timeout)
+            return
+        except TimeoutError:
+            self.overflowed += 1
+        logger.warning(f"Notification queue is full, sending {notification.type} inline [overflowed={self.overflowed}]")
+        try:
+            await self.handler([notification])
+        except Exception as e:
+            logger.exception(f"Failed to send notification {notification.type}: {e}")
+
+    async def _work(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]  # type: ignore
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(queue.get_nowait())  # type: ignore
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self.handler(batch)
+            except Exception as e:
+                logger.exception(f"Failed to send {len(batch)} notifications: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()  # type: ignore
+
+    async def drain(self, timeout: float | None = None) -> None:
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except TimeoutError:
+            logger.warning(f"Notification drain timed out, {self._queue.qsize()} notifications not sent")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._queue, self._workers, self._loop = None, [], None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "workers": len(self._workers),
+            "waited": self.waited,
+            "overflowed": self.overflowed,
+        }
+
+
+class DigestBuffer:
+    """Collects notifications per type for ``window`` seconds and submits them as one summary.
+
+    The window opens with the first notification of a type; a window with a single notification
+    submits it unchanged.
+    """
+
+    def __init__(self, dispatcher: NotificationDispatcher, summarize: Summarizer, *, window: float) -> None:
+        self.dispatcher = dispatcher
+        self.summarize = summarize
+        self.window = window
+        self._pending: dict[typing.Any, list[Notification]] = {}
+        self._opened: dict[typing.Any, datetime.datetime] = {}
+        self._timers: dict[typing.Any, asyncio.TimerHandle] = {}
+        self._flushing: set[asyncio.Task] = set()
+
+    def add(self, notification: Notification) -> None:
+        pending = self._pending.setdefault(notification.type, [])
+        if not pending:
+            self._opened[notification.type] = datetime.datetime.now(datetime.UTC)
+            self._timers[notification.type] = asyncio.get_running_loop().call_later(
+                self.window, self._schedule_flush, notification.type
+            )
+        pending.append(notification)
+
+    def _schedule_flush(self, notification_type: typing.Any) -> None:
+        task = asyncio.ensure_future(self.flush(notification_type))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def flush(self, notification_type: typing.Any) -> None:
+        pending = self._pending.pop(notification_type, [])
+        opened = self._opened.pop(notification_type, None)
+        timer = self._timers.pop(notification_type, None)
+        if timer is not None:
+            timer.cancel()
+        if len(pending) == 1:
+            await self.dispatcher.submit(pending[0])
+        elif pending:
+            await self.dispatcher.submit(self.summarize(pending, opened))  # type: ignore
+
+    async def flush_all(self) -> None:
+        for notification_type in list(self._pending):
+            await self.flush(notification_type)
+        await asyncio.gather(*self._flushing, return_exceptions=True)
+
+
+def create(handler: Handler) -> NotificationDispatcher:
+    return NotificationDispatcher(
+        handler,
+        size=config.app.notification_queue_size,
+        workers=config.app.notification_workers,
+        batch_size=config.app.notification_batch_size,
+        put_timeout=config.app.notification_put_timeout,
+    )
@@ -17,13 +17,13 @@ async def get_user_accounts(session: AsyncSession, user: schemas.UserRead) -> sc
     )
 
 
-def send_response_approved(
+async def send_response_approved(
     user: schemas.UserRead,
     order: schemas.OrderReadSystem,
     response: schemas.ResponseRead,
     text: str,
 ) -> None:
-    service.send_user_notification(
+    await service.send_user_notification(
         schemas.NotificationSendUser(
             type=models.NotificationType.ORDER_RESPONSE_APPROVE,
             user=user,
@@ -32,8 +32,8 @@ def send_response_approved(
     )
 
 
-def send_response_declined(user: schemas.UserRead, order_id: str) -> None:
-    service.send_user_notification(
+async def send_response_declined(user: schemas.UserRead, order_id: str) -> None:
+    await service.send_user_notification(
         schemas.NotificationSendUser(
             type=models.NotificationType.ORDER_RESPONSE_DECLINE,
             user=user,
@@ -42,34 +42,36 @@ def send_response_declined(user: schemas.UserRead, order_id: str) -> None:
     )
 
 
-def send_logged_notify(user: schemas.UserReadWithAccounts, integration: enums.Integration) -> None:
-    service.send_system_notification(
+async def send_logged_notify(user: schemas.UserReadWithAccounts, integration: enums.Integration) -> None:
+    await service.send_system_notification(
         schemas.NotificationSendSystem(
             type=models.NotificationType.LOGGED_NOTIFY, data={"user": user, "integration": integration}
         ),
     )
 
 
-def send_registered_notify(user: schemas.UserReadWithAccounts, integration: enums.Integration) -> None:
-    service.send_system_notification(
+async def send_registered_notify(user: schemas.UserReadWithAccounts, integration: enums.Integration) -> None:
+    await service.send_system_notification(
         schemas.NotificationSendSystem(
             type=models.NotificationType.REGISTERED_NOTIFY, data={"user": user, "integration": integration}
         ),
     )
 
 
-def send_verified_notify(user: schemas.UserReadWithAccounts) -> None:
-    service.send_user_notification(schemas.NotificationSendUser(type=models.NotificationType.VERIFIED_NOTIFY, user=user))
+async def send_verified_notify(user: schemas.UserReadWithAccounts) -> None:
+    await service.send_user_notification(
+        schemas.NotificationSendUser(type=models.NotificationType.VERIFIED_NOTIFY, user=user)
+    )
 
 
-def send_request_verify(user: schemas.UserReadWithAccounts) -> None:
-    service.send_system_notification(
+async def send_request_verify(user: schemas.UserReadWithAccounts) -> None:
+    await service.send_system_notification(
         schemas.NotificationSendSystem(type=models.NotificationType.REQUEST_VERIFY, data={"user": user})
     )
 
 
-def send_order_close_notify(user: schemas.UserRead, order_id: str, url: str, message: str) -> None:
-    service.send_system_notification(
+async def send_order_close_notify(user: schemas.UserRead, order_id: str, url: str, message: str) -> None:
+    await service.send_system_notification(
         schemas.NotificationSendSystem(
             type=models.NotificationType.ORDER_CLOSE_REQUEST,
             data={"user": user, "order_id": order_id, "url": url, "message": message},
@@ -77,8 +79,10 @@ def send_order_close_notify(user: schemas.UserRead, order_id: str, url: str, mes
     )
 
 
-def send_sent_order_notify(order_id: str, integration: enums.Integration, payload: schemas.MessageCallback) -> None:
-    service.send_system_notification(
+async def send_sent_order_notify(
+    order_id: str, integration: enums.Integration, payload: schemas.MessageCallback
+) -> None:
+    await service.send_system_notification(
         schemas.NotificationSendSystem(
             type=models.NotificationType.ORDER_SENT_NOTIFY,
             data={"order_id": order_id, "integration": integration, "payload": payload},
@@ -86,8 +90,10 @@ def send_sent_order_notify(order_id: str, integration: enums.Integration, payloa
     )
 
 
-def send_edited_order_notify(order_id: str, integration: enums.Integration, payload: schemas.MessageCallback) -> None:
-    service.send_system_notification(
+async def send_edited_order_notify(
+    order_id: str, integration: enums.Integration, payload: schemas.MessageCallback
+) -> None:
+    await service.send_system_notification(
         schemas.NotificationSendSystem(
             type=models.NotificationType.ORDER_EDITED_NOTIFY,
             data={"order_id": order_id, "integration": integration,  "payload": payload},
@@ -95,8 +101,10 @@ def send_edited_order_notify(order_id: str, integration: enums.Integration, payl
     )
 
 
-def send_deleted_order_notify(order_id: str, integration: enums.Integration, payload: schemas.MessageCallback) -> None:
-    service.send_system_notification(
+async def send_deleted_order_notify(
+    order_id: str, integration: enums.Integration, payload: schemas.MessageCallback
+) -> None:
+    await service.send_system_notification(
         schemas.NotificationSendSystem(
             type=models.NotificationType.ORDER_DELETED_NOTIFY,
             data={"order_id": order_id, "integration": integration,  "payload": payload},
@@ -104,8 +112,8 @@ def send_deleted_order_notify(order_id: str, integration: enums.Integration, pay
     )
 
 
-def send_response_chose_notify(order_id: str, user: schemas.UserReadWithAccounts, responses: int) -> None:
-    service.send_system_notification(
+async def send_response_chose_notify(order_id: str, user: schemas.UserReadWithAccounts, responses: int) -> None:
+    await service.send_system_notification(
         schemas.NotificationSendSystem(
             type=models.NotificationType.RESPONSE_CHOSE_NOTIFY,
             data={"order_id": order_id, "user": user, "responses": responses},
@@ -113,8 +121,8 @@ def send_response_chose_notify(order_id: str, user: schemas.UserReadWithAccounts
     )
 
 
-def send_order_paid_notify(order: schemas.OrderReadSystem, user: schemas.UserRead) -> None:
-    service.send_system_notification(
+async def send_order_paid_notify(order: schemas.OrderReadSystem, user: schemas.UserRead) -> None:
+    await service.send_system_notification(
         schemas.NotificationSendSystem(
             type=models.NotificationType.ORDER_PAID_NOTIFY,
             data={"order": order, "user": user},
@@ -1,15 +1,20 @@
 import asyncio
+import datetime
+import typing
+from collections import defaultdict
 
 import sqlalchemy as sa
+from cashews import cache
+from loguru import logger
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import models, schemas
-from src.core import db, enums, errors
-from src.services.integrations.discord import service as discord_service
+from src.core import config, db, enums, errors
+from src.services.integrations.message import service as message_service
 from src.services.integrations.telegram import service as telegram_service
 
-from . import utils
+from . import dispatcher, utils
 
 
 async def get_user_notification(
@@ -36,6 +41,7 @@ async def create_user_notification(
             status_code=400,
             detail=[errors.ApiException(code="already_exists", msg="Notification already exists")],
         ) from e
+    await cache.delete(f"notification_targets_{user.id}")
     return result.scalars().first()
 
 
@@ -50,6 +56,7 @@ async def delete_user_notification(
         )
     await session.delete(notification)
     await session.commit()
+    await cache.delete(f"notification_targets_{user.id}")
     return notification
 
 
@@ -59,12 +66,75 @@ async def get_user_notification_by_user_id(session: AsyncSession, user_id: int)
     return result.scalars().all()  # type: ignore
 
 
-def send_user_notification(payload: schemas.NotificationSendUser):
-    asyncio.create_task(_send_user(payload))
-
-
-def send_system_notification(payload: schemas.NotificationSendSystem):
-    asyncio.create_task(_send_system(payload))
+async def get_notification_targets(user_ids: typing.Iterable[int]) -> dict[int, list[enums.Integration]]:
+    """Integrations each user gets notifications on, cached per user; misses are loaded in one query."""
+    user_ids = list(dict.fromkeys(user_ids))
+    cached = await cache.get_many(*(f"notification_targets_{user_id}" for user_id in user_ids))
+    targets = {user_id: value for user_id, value in zip(user_ids, cached) if value is not None}
+    missing = [user_id for user_id in user_ids if user_id not in targets]
+    if missing:
+        async with db.async_session_maker() as session:
+            query = sa.select(models.UserNotification.user_id, models.UserNotification.type).where(
+                models.UserNotification.user_id.in_(missing)
+            )
+            result = await session.execute(query)
+        for user_id in missing:
+            targets[user_id] = []
+        for user_id, integration in result:
+            targets[user_id].append(integration)
+        for user_id in missing:
+            await cache.set(
+                f"notification_targets_{user_id}", targets[user_id], expire=config.app.notification_targets_cache_ttl
+            )
+    return targets
+
+
+async def send_user_notification(payload: schemas.NotificationSendUser):
+    await _dispatcher.submit(payload)
+
+
+async def send_system_notification(payload: schemas.NotificationSendSystem):
+    if _digest is not None and payload.type.value in config.app.notification_digest_types:
+        _digest.add(payload)
+    else:
+        await _dispatcher.submit(payload)
+
+
+async def drain(timeout: float | None = None) -> None:
+    if _digest is not None:
+        await _digest.flush_all()
+    await _dispatcher.drain(timeout)
+
+
+def summarize(
+    notifications: list[schemas.NotificationSendSystem], opened_at: datetime.datetime
+) -> schemas.NotificationSendSystem:
+    """One ``DIGEST_NOTIFY`` for a window of system notifications of the same type."""
+    order_ids: list[str] = []
+    integrations: dict[str, int] = defaultdict(int)
+    totals: dict[str, int] = defaultdict(int)
+    for notification in notifications:
+        data = notification.data
+        if data.get("order_id") is not None and data["order_id"] not in order_ids:
+            order_ids.append(data["order_id"])
+        if data.get("integration") is not None:
+            integrations[data["integration"]] += 1
+        callback = data.get("payload")
+        if isinstance(callback, schemas.MessageCallback):
+            for field in ("created", "updated", "deleted", "skipped"):
+                totals[field] += len(getattr(callback, field))
+    return schemas.NotificationSendSystem(
+        type=models.NotificationType.DIGEST_NOTIFY,
+        data={
+            "type": notifications[0].type,
+            "count": len(notifications),
+            "opened_at": opened_at,
+            "closed_at": datetime.datetime.now(datetime.UTC),
+            "order_ids": order_ids,
+            "integrations": dict(integrations),
+            "totals": dict(totals),
+        },
+    )
 
 
 async def get_user_accounts(session: AsyncSession, user: schemas.UserRead) -> schemas.UserReadWithAccounts:
@@ -75,24 +145,43 @@ async def get_user_accounts(session: AsyncSession, user: schemas.UserRead) -> sc
     )
 
 
-async def _send_user(payload: schemas.NotificationSendUser):
-    async with db.async_session_maker() as session:
-        entities = await get_user_notification_by_user_id(session, payload.user.id)
-        url = utils.path_resolver[payload.type]
-        data = payload.data
-        if data is None:
-            data = {"user": payload.user}
-        else:
-            data["user"] = payload.user
-        for source in entities:
-            if source.type == enums.Integration.telegram:
-                await telegram_service.request(url, "POST", data=data)
-            elif source.type == enums.Integration.discord:
-                await discord_service.request(url, "POST", data=data)
-            else:
-                raise NotImplementedError(f"Notification type {source.type} not implemented")
-
-
-async def _send_system(payload: schemas.NotificationSendSystem):
-    url = utils.path_resolver[payload.type]
-    await telegram_service.request(url, "POST", data=payload.data)
+async def _send(integration: enums.Integration, url: str, data: dict, rate_key: int | None) -> None:
+    try:
+        await message_service.request(integration, url, "POST", data=data, rate_key=rate_key)
+    except (errors.ApiHTTPException, ValueError) as e:
+        logger.warning(f"Notification {url} via {integration} failed: {e}")
+
+
+async def _send_group(integration: enums.Integration, sends: list[tuple[str, dict, int | None]]) -> None:
+    if len(sends) > 1 and await message_service.supports_bulk(integration, "bulk_notifications"):
+        payload = {"notifications": [{"path": url, "data": data} for url, data, _ in sends]}
+        await _send(integration, "notification/bulk", payload, None)
+        return
+    await asyncio.gather(*(_send(integration, url, data, rate_key) for url, data, rate_key in sends))
+
+
+async def send_batch(notifications: list[schemas.NotificationSendUser | schemas.NotificationSendSystem]) -> None:
+    """Resolve the targets of a batch and send it grouped by integration, in bulk where the bot supports it."""
+    users = [item.user.id for item in notifications if isinstance(item, schemas.NotificationSendUser)]
+    targets = await get_notification_targets(users) if users else {}
+    groups: dict[enums.Integration, list[tuple[str, dict, int | None]]] = defaultdict(list)
+    for item in notifications:
+        url = utils.path_resolver[item.type]
+        if isinstance(item, schemas.NotificationSendSystem):
+            groups[enums.Integration.telegram].append((url, item.data, None))
+            continue
+        data = {**(item.data or {}), "user": item.user}
+        for integration in targets[item.user.id]:
+            if integration not in (enums.Integration.telegram, enums.Integration.discord):
+                logger.warning(f"Notification type {integration} not implemented")
+                continue
+            groups[integration].append((url, data, item.user.id))
+    await asyncio.gather(*(_send_group(integration, sends) for integration, sends in groups.items()))
+
+
+_dispatcher = dispatcher.create(send_batch)
+_digest = (
+    dispatcher.DigestBuffer(_dispatcher, summarize, window=config.app.notification_digest_window)
+    if config.app.notification_digest_window > 0
+    else None
+)
@@ -14,4 +14,5 @@ path_resolver: dict[models.NotificationType, str] = {
     models.NotificationType.ORDER_DELETED_NOTIFY: "notification/order_deleted",
     models.NotificationType.RESPONSE_CHOSE_NOTIFY: "notification/response_chose",
     models.NotificationType.ORDER_PAID_NOTIFY: "notification/order_paid",
+    models.NotificationType.DIGEST_NOTIFY: "notification/digest",
 }
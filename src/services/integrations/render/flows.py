@@ -1,12 +1,17 @@
+import hashlib
 import re
+import typing
 
 import jinja2
+import orjson
+from cashews import cache
 from jinja2 import FunctionLoader
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from src import models, schemas
-from src.core import enums, errors
+from src.core import config, db, enums, errors
 
 from . import service
 
@@ -56,17 +61,13 @@ async def check_availability_all_render_config_order(
     session: AsyncSession,
     integration: enums.Integration,
     order_model: schemas.OrderReadSystem | schemas.PreOrderReadSystem,
+    *,
+    context: schemas.RenderContext | None = None,
 ) -> tuple[bool, list[str]]:
-    configs = await service.get_all_configs_for_order(session, integration, order_model)
-    names = service.get_all_config_names(order_model)
-    exist_names = [cfg.name for cfg in configs]
-    if len(configs) != len(names):
-        missing = []
-        for name in names:
-            if name not in exist_names:
-                missing.append(name)
-        return False, missing
-    return True, []
+    if context is None:
+        context = await service.get_render_context(session, integration, order_model.info.game)
+    missing = context.missing(service.get_all_config_names(order_model))
+    return not missing, missing
 
 
 def _render(pre_render: str) -> str:
@@ -102,19 +103,49 @@ def _get_template_env() -> jinja2.Environment:
     return _get_template_env.template_env
 
 
+def _render_version(value: typing.Any) -> typing.Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, db.Base):
+        return value.to_dict()
+    return value
+
+
+def _rendered_key(context: schemas.RenderContext, templates: list[str], data: dict) -> str:
+    # Everything the output depends on: the templates with their versions and the render data itself
+    versions = []
+    for name in templates:
+        template = context.get(name)
+        versions.append((name, template.id, template.version) if template else (name,))
+    payload = {key: _render_version(value) for key, value in data.items()}
+    signature = orjson.dumps([context.integration, versions, payload], default=str, option=orjson.OPT_SORT_KEYS)
+    return f"rendered:{hashlib.sha1(signature, usedforsecurity=False).hexdigest()}"
+
+
 async def get_order_text(
     session: AsyncSession,
     integration: enums.Integration,
     templates: list[str],
     *,
     data: dict,
+    context: schemas.RenderContext | None = None,
 ) -> str:
+    if context is None:
+        context = await service.get_render_context(session, integration, data["order"].info.game)
+    key = _rendered_key(context, templates, data)
+    text = await cache.get(key)
+    if text is None:
+        text = _render_order_text(context, templates, data)
+        await cache.set(key, text, expire=config.app.render_output_cache_ttl)
+    return text
+
+
+def _render_order_text(context: schemas.RenderContext, templates: list[str], data: dict) -> str:
     resp: list[str] = []
     for index, render_config_name in enumerate(templates, 1):
-        render_config = await service.get_by_name(session, integration, render_config_name)
+        render_config = context.get(render_config_name)
         if render_config:
-            template = jinja2.Template(render_config.binary)
-            rendered = template.render(**data)
+            rendered = service.get_template(render_config).render(**data)
             is_empty = len(rendered.replace("\n", "").replace("<br>", "").replace(" ", "")) < 1
             if not render_config.allow_separator_top and (len(resp) > 0 or is_empty):
                 resp.pop(-1)
@@ -134,10 +165,11 @@ async def generate_body(
     is_preorder: bool,
     is_gold: bool,
 ) -> tuple[bool, str]:
-    status, missing = await check_availability_all_render_config_order(session, integration, order)
+    context = await service.get_render_context(session, integration, order.info.game)
+    status, missing = await check_availability_all_render_config_order(session, integration, order, context=context)
     if not status:
         return status, f"Some configs for order missing, configs=[{', '.join(missing)}]"
     if not configs:
         configs = get_order_configs(order, is_preorder=is_preorder, is_gold=is_gold)
-    text = await get_order_text(session, integration, configs, data={"order": order})
+    text = await get_order_text(session, integration, configs, data={"order": order}, context=context)
     return status, text
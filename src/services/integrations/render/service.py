@@ -1,35 +1,86 @@
+import typing
+
+import jinja2
 import sqlalchemy as sa
 from cashews import cache
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from src import models, schemas
-from src.core import enums, errors, pagination
+from src.core import config, enums, errors, pagination
 
+# Sources of the render config templates by template name, see ``get_template``
+_template_sources: dict[str, str] = {}
 
-def get_all_config_names(
-    order: schemas.OrderReadSystem | schemas.PreOrderReadSystem,
-) -> list[str]:
+
+def _load_template_source(name: str) -> tuple[str, None, typing.Callable[[], bool]] | None:
+    source = _template_sources.get(name)
+    if source is None:
+        return None
+    # The name carries the config version, so a compiled template never goes stale
+    return source, None, lambda: True
+
+
+def _get_template_env() -> jinja2.Environment:
+    if not getattr(_get_template_env, "template_env", None):
+        bytecode_cache = None
+        if config.app.render_bytecode_cache_dir:
+            bytecode_cache = jinja2.FileSystemBytecodeCache(config.app.render_bytecode_cache_dir)
+        env = jinja2.Environment(
+            loader=jinja2.FunctionLoader(_load_template_source),
+            cache_size=config.app.render_template_cache_size,
+            bytecode_cache=bytecode_cache,
+        )
+        _get_template_env.template_env = env  # type: ignore
+    return _get_template_env.template_env  # type: ignore
+
+
+def get_template(render_config: schemas.RenderTemplate) -> jinja2.Template:
+    """Compiled template of the render config, cached by (id, version) in a shared environment."""
+    version = render_config.version
+    name = f"{render_config.id}:{version.timestamp() if version else 0}"
+    _template_sources[name] = render_config.binary
+    return _get_template_env().get_template(name)
+
+
+def evict_templates(config_id: int) -> None:
+    prefix = f"{config_id}:"
+    for name in [name for name in _template_sources if name.startswith(prefix)]:
+        del _template_sources[name]
+    env_cache = _get_template_env().cache
+    if env_cache is not None:
+        for key in [key for key in env_cache.keys() if key[1].startswith(prefix)]:
+            del env_cache[key]
+
+
+def get_config_names(game: str) -> list[str]:
     return [
         "order",
         "eta-price",
         "eta-price-gold",
         "response",
         "response-check",
-        order.info.game,
-        f"{order.info.game}-cd",
+        game,
+        f"{game}-cd",
         "pre-order",
         "pre-eta-price",
         "pre-eta-price-gold",
     ]
 
 
+def get_all_config_names(
+    order: schemas.OrderReadSystem | schemas.PreOrderReadSystem,
+) -> list[str]:
+    return get_config_names(order.info.game)
+
+
 async def get(session: AsyncSession, config_id: int) -> models.RenderConfig | None:
     query = sa.select(models.RenderConfig).where(models.RenderConfig.id == config_id)
     result = await session.execute(query)
     return result.scalars().first()
 
 
+@cache.invalidate("render_context_*")
 async def create(session: AsyncSession, config_in: schemas.RenderConfigCreate) -> models.RenderConfig:
     model = models.RenderConfig(**config_in.model_dump())
     session.add(model)
@@ -37,7 +88,7 @@ async def create(session: AsyncSession, config_in: schemas.RenderConfigCreate) -
     return model
 
 
-@cache.invalidate("render_config_*")
+@cache.invalidate("render_context_*")
 async def delete(session: AsyncSession, config_id: int) -> models.RenderConfig:
     config = await get(session, config_id)
     if not config:
@@ -52,10 +103,10 @@ async def delete(session: AsyncSession, config_id: int) -> models.RenderConfig:
         )
     await session.delete(config)
     await session.commit()
+    evict_templates(config_id)
     return config
 
 
-@cache.cache(ttl=3600, key="render_config_{integration}_{name}")
 async def get_by_name(session: AsyncSession, integration: enums.Integration, name: str) -> models.RenderConfig | None:
     query = sa.select(models.RenderConfig).where(
         models.RenderConfig.name == name, models.RenderConfig.integration == integration
@@ -76,7 +127,7 @@ async def get_by_names(
     return result.scalars().all()  # type: ignore
 
 
-@cache.invalidate("render_config_{parser.integration}_{parser.name}")
+@cache.invalidate("render_context_*")
 async def update(
     session: AsyncSession,
     parser: models.RenderConfig,
@@ -88,16 +139,32 @@ async def update(
 
     session.add(parser)
     await session.commit()
+    evict_templates(parser.id)
     return parser
 
 
-async def get_all_configs_for_order(
-    session: AsyncSession,
-    integration: enums.Integration,
-    order: schemas.OrderReadSystem | schemas.PreOrderReadSystem,
-) -> list[models.RenderConfig]:
-    names = get_all_config_names(order)
-    return await get_by_names(session, integration, names)
+@cache.cache(ttl=3600, key="render_context_{integration}_{game}")
+async def get_render_context(session: AsyncSession, integration: enums.Integration, game: str) -> schemas.RenderContext:
+    """Load every config an order of ``game`` can render with, in one query.
+
+    The result holds no ORM instances, so it is safe to share between sessions. It is dropped
+    by ``create``, ``update`` and ``delete``.
+    """
+    configs = await get_by_names(session, integration, get_config_names(game))
+    templates: dict[str, schemas.RenderTemplate] = {}
+    for render_config in sorted(configs, key=lambda c: c.id):
+        templates.setdefault(
+            render_config.name,
+            schemas.RenderTemplate(
+                id=render_config.id,
+                name=render_config.name,
+                binary=render_config.binary,
+                allow_separator_top=render_config.allow_separator_top,
+                separator=render_config.separator,
+                version=render_config.updated_at or render_config.created_at,
+            ),
+        )
+    return schemas.RenderContext(integration=integration, game=game, templates=tuple(templates.values()))
 
 
 async def get_by_filter(
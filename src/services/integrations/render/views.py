@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import ORJSONResponse
 from starlette import status
 
@@ -9,6 +9,7 @@ from src.services.auth import flows as auth_flows
 from src.services.order import flows as order_flows
 from src.services.preorder import flows as preorder_flows
 from src.services.response import flows as response_flows
+from src.utils import etag
 
 from . import flows, service
 
@@ -71,6 +72,7 @@ async def delete_render_config(
 
 @router.get("/order")
 async def render_order(
+    request: Request,
     order_id: int,
     integration: enums.Integration,
     is_preorder: bool = False,
@@ -157,4 +159,5 @@ async def render_order(
             data = await flows.generate_body(session, integration, order_read, configs, is_preorder, is_gold)
             text = data[1]
 
-    return ORJSONResponse({"text": text})
+    response = ORJSONResponse({"text": text})
+    return etag.not_modified(request, response, etag.make(text)) or response
@@ -1,11 +1,19 @@
+import asyncio
+
 from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from src import models, schemas
 from src.core import errors
 from src.services.integrations.notifications import flows as notifications_flows
+from src.services.order import flows as order_flows
+from src.services.order import service as order_service
+from src.services.outbox import service as outbox_service
 from src.services.payroll import service as payroll_service
+from src.services.preorder import flows as preorder_flows
+from src.services.preorder import service as preorder_service
 from src.services.tasks import service as tasks_service
 
 from . import service
@@ -105,17 +113,177 @@ async def get_order_from_sheets(session: AsyncSession, data: models.SheetEntity,
     return model
 
 
+async def get_orders_from_sheets(
+    session: AsyncSession, data: list[models.SheetEntity], user: models.User
+) -> list[models.OrderReadSheets | errors.ApiHTTPException]:
+    token = await service.get_token(session, user)
+    if not token:
+        raise errors.ApiHTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=[errors.ApiException(msg="Google Service account doesn't setup.", code="not_exist")],
+        )
+    sheets: dict[tuple[str, int], list[int]] = {}
+    for index, entity in enumerate(data):
+        sheets.setdefault((entity.spreadsheet, entity.sheet_id), []).append(index)
+
+    resp: list[models.OrderReadSheets | errors.ApiHTTPException] = [None] * len(data)  # type: ignore
+    for (spreadsheet, sheet_id), indexes in sheets.items():
+        parser = await service.get_by_spreadsheet_sheet_read(session, spreadsheet, sheet_id)
+        if parser is None:
+            for index in indexes:
+                resp[index] = errors.ApiHTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=[
+                        errors.ApiException(
+                            msg="A Spreadsheet parse with this spreadsheet and sheet_id does not exist.",
+                            code="not_exist",
+                        )
+                    ],
+                )
+            continue
+        rows = await asyncio.to_thread(
+            service.get_rows_data, models.OrderReadSheets, token.token, parser, [data[i].row_id for i in indexes]
+        )
+        for index, row in zip(indexes, rows, strict=True):
+            if isinstance(row, ValidationError):
+                resp[index] = errors.GoogleSheetsParserError.http_exception(
+                    models.OrderReadSheets, spreadsheet, sheet_id, data[index].row_id, row
+                )
+            else:
+                resp[index] = row  # type: ignore
+    return resp
+
+
+async def create_orders_from_sheets(
+    session: AsyncSession, data: list[models.SheetEntity], user: models.User
+) -> list[schemas.SheetEntityBulkResult]:
+    rows = await get_orders_from_sheets(session, data, user)
+    results = [schemas.SheetEntityBulkResult(entity=entity) for entity in data]
+    orders: list[tuple[int, schemas.OrderCreate]] = []
+    preorders: list[tuple[int, schemas.PreOrderCreate]] = []
+    for index, row in enumerate(rows):
+        if isinstance(row, errors.ApiHTTPException):
+            results[index].errors.extend(errors.ApiException.model_validate(e) for e in row.detail)
+            continue
+        results[index].order_id = row.order_id
+        try:
+            if row.shop_order_id:
+                orders.append((index, schemas.OrderCreate.model_validate(row.model_dump())))
+            else:
+                preorders.append((index, schemas.PreOrderCreate.model_validate(row.model_dump())))
+        except ValidationError as e:
+            results[index].errors.extend(errors.api_exceptions(e))
+
+    existing = {o.order_id for o in await order_service.get_by_order_ids(session, [o.order_id for _, o in orders])}
+    created_orders: dict[int, int] = {}
+    created_preorders: dict[int, int] = {}
+    for index, order_in in orders:
+        if order_in.order_id in existing:
+            results[index].errors.append(
+                errors.ApiException(
+                    msg=f"A order with this id already exist. [order_id={order_in.order_id}]",
+                    code="already_exist",
+                )
+            )
+            continue
+        try:
+            async with session.begin_nested():
+                order = await order_service.create(session, order_in, commit=False)
+        except SQLAlchemyError as e:
+            results[index].errors.append(errors.ApiException(msg=str(e.__cause__ or e), code="invalid_data"))
+            continue
+        except errors.ApiHTTPException as e:
+            results[index].errors.extend(errors.api_exceptions(e))
+            continue
+        existing.add(order_in.order_id)
+        created_orders[order.id] = index
+    for index, preorder_in in preorders:
+        try:
+            async with session.begin_nested():
+                preorder = await preorder_service.create(session, preorder_in, commit=False)
+        except SQLAlchemyError as e:
+            results[index].errors.append(errors.ApiException(msg=str(e.__cause__ or e), code="invalid_data"))
+            continue
+        except errors.ApiHTTPException as e:
+            results[index].errors.extend(errors.api_exceptions(e))
+            continue
+        created_preorders[preorder.id] = index
+    await session.commit()
+
+    for order in await order_service.get_by_ids(session, list(created_orders.keys())):
+        results[created_orders[order.id]].result = await order_flows.format_order_system(session, order)
+    for preorder in await preorder_service.get_by_ids(session, created_preorders.keys()):
+        results[created_preorders[preorder.id]].result = await preorder_flows.format_preorder_system(session, preorder)
+    return results
+
+
+async def update_orders_from_sheets(
+    session: AsyncSession, data: list[models.SheetEntity], user: models.User, *, patch: bool = False
+) -> list[schemas.SheetEntityBulkResult]:
+    rows = await get_orders_from_sheets(session, data, user)
+    results = [schemas.SheetEntityBulkResult(entity=entity) for entity in data]
+    parsed: list[tuple[int, models.OrderReadSheets]] = []
+    for index, row in enumerate(rows):
+        if isinstance(row, errors.ApiHTTPException):
+            results[index].errors.extend(errors.ApiException.model_validate(e) for e in row.detail)
+        else:
+            results[index].order_id = row.order_id
+            parsed.append((index, row))
+
+    orders_id = [row.order_id for _, row in parsed if row.shop_order_id]
+    preorders_id = [row.order_id for _, row in parsed if not row.shop_order_id]
+    orders = {order.order_id: order for order in await order_service.get_by_order_ids(session, orders_id)}
+    preorders = {order.order_id: order for order in await preorder_service.get_by_order_ids(session, preorders_id)}
+    updated: list[tuple[int, models.Order | models.PreOrder]] = []
+    for index, row in parsed:
+        target = orders.get(row.order_id) if row.shop_order_id else preorders.get(row.order_id)
+        if target is None:
+            results[index].errors.append(
+                errors.ApiException(msg=f"A order with this id does not exist. [order_id={row.order_id}]", code="not_exist")
+            )
+            continue
+        try:
+            async with session.begin_nested():
+                if isinstance(target, models.Order):
+                    update_model = schemas.OrderUpdate.model_validate(row.model_dump())
+                    await order_service.update(session, target, update_model, patch=patch, commit=False)
+                else:
+                    preorder_model = schemas.PreOrderUpdate.model_validate(row.model_dump())
+                    await preorder_service.update(session, target, preorder_model, patch=patch, commit=False)
+        except SQLAlchemyError as e:
+            results[index].errors.append(errors.ApiException(msg=str(e.__cause__ or e), code="invalid_data"))
+            continue
+        except (ValidationError, errors.ApiHTTPException) as e:
+            results[index].errors.extend(errors.api_exceptions(e))
+            continue
+        updated.append((index, target))
+    await session.commit()
+
+    preorders_updated = await preorder_service.get_by_ids(
+        session, [target.id for _, target in updated if isinstance(target, models.PreOrder)]
+    )
+    preorders_map = {preorder.id: preorder for preorder in preorders_updated}
+    for index, target in updated:
+        if isinstance(target, models.Order):
+            results[index].result = await order_flows.format_order_system(session, target)
+        else:
+            results[index].result = await preorder_flows.format_preorder_system(session, preorders_map[target.id])
+    return results
+
+
 async def order_to_sheets(
     session: AsyncSession,
     order: models.Order,
     order_in: schemas.OrderReadSystem,
 ):
+    """Queue the row update in the outbox; the caller commits it together with the order change."""
     parser = await get_by_spreadsheet_sheet_read(session, order.spreadsheet, order.sheet_id)
     if parser is not None:
-        tasks_service.update_order.delay(
-            parser.model_dump(mode="json"),
-            order.row_id,
-            order_in.model_dump(mode="json"),
+        outbox_service.add(
+            session,
+            models.OutboxKind.SHEETS_UPDATE_ORDER,
+            {"parser": parser.model_dump(mode="json"), "row_id": order.row_id, "data": order_in.model_dump(mode="json")},
+            order_id=order.id,
         )
 
 
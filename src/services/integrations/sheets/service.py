@@ -391,6 +391,29 @@ def get_row_data(
     return parse_row(parser, model, row_id, row[0], is_raise=is_raise)  # type: ignore
 
 
+def get_rows_data(
+    model: typing.Type[models.SheetEntity],
+    creds: models.AdminGoogleTokenDB,
+    parser: models.OrderSheetParseRead,
+    rows_id: list[int],
+) -> list[models.SheetEntity | ValidationError]:
+    gc = gspread.service_account_from_dict(creds)
+    sh = gc.open(parser.spreadsheet)
+    sheet = sh.get_worksheet_by_id(parser.sheet_id)
+    value_ranges = sheet.batch_get(
+        [get_range(parser, row_id=row_id) for row_id in rows_id],
+        value_render_option=ValueRenderOption.unformatted,
+        date_time_render_option=DateTimeOption.formatted_string,
+    )
+    resp: list[models.SheetEntity | ValidationError] = []
+    for row_id, value_range in zip(rows_id, value_ranges, strict=True):
+        try:
+            resp.append(parse_row(parser, model, row_id, value_range[0] if value_range else []))  # type: ignore
+        except ValidationError as error:
+            resp.append(error)
+    return resp
+
+
 def update_row_data(
     creds: models.AdminGoogleTokenDB,
     parser: models.OrderSheetParseRead,
@@ -1,5 +1,5 @@
 import sqlalchemy as sa
-from fastapi import APIRouter, Depends, UploadFile
+from fastapi import APIRouter, Depends, Request, Response, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.functions import count
 
@@ -14,6 +14,7 @@ from src.services.order import flows as orders_flows
 from src.services.order import service as orders_service
 from src.services.preorder import flows as preorder_flows
 from src.services.preorder import service as preorder_service
+from src.utils import etag
 
 from . import flows, service
 
@@ -102,8 +103,37 @@ async def delete_order_from_sheets(
         return await preorder_service.delete(session, preorder.id)
 
 
+@router.post("/order/bulk", response_model=list[schemas.SheetEntityBulkResult])
+async def fetch_orders_from_sheets(
+    data: list[models.SheetEntity],
+    user: models.User = Depends(auth_flows.current_active_superuser_api),
+    session=Depends(db.get_async_session),
+):
+    return await flows.create_orders_from_sheets(session, data, user)
+
+
+@router.put("/order/bulk", response_model=list[schemas.SheetEntityBulkResult])
+async def update_orders_from_sheets(
+    data: list[models.SheetEntity],
+    user: models.User = Depends(auth_flows.current_active_superuser_api),
+    session=Depends(db.get_async_session),
+):
+    return await flows.update_orders_from_sheets(session, data, user)
+
+
+@router.patch("/order/bulk", response_model=list[schemas.SheetEntityBulkResult])
+async def patch_orders_from_sheets(
+    data: list[models.SheetEntity],
+    user: models.User = Depends(auth_flows.current_active_superuser_api),
+    session=Depends(db.get_async_session),
+):
+    return await flows.update_orders_from_sheets(session, data, user, patch=True)
+
+
 @router.get("/parser/filter", response_model=pagination.Paginated[models.OrderSheetParseRead])
 async def filter_google_sheets_parser(
+    request: Request,
+    response: Response,
     params: pagination.PaginationParams = Depends(),
     spreadsheet: str | None = None,
     _: models.User = Depends(auth_flows.current_active_superuser),
@@ -113,22 +143,34 @@ async def filter_google_sheets_parser(
     if spreadsheet:
         query = query.where(models.OrderSheetParse.spreadsheet == spreadsheet)
     result = await session.execute(query)
+    parsers = result.scalars().all()
+    total = (await session.execute(sa.select(count(models.OrderSheetParse.id)))).one()[0]
+    tag = etag.make(params.model_dump(mode="json"), spreadsheet, total, etag.row_versions(*parsers))
+    not_modified = etag.not_modified(request, response, tag)
+    if not_modified:
+        return not_modified
     return pagination.Paginated(
         page=params.page,
         per_page=params.per_page,
-        total=(await session.execute(sa.select(count(models.OrderSheetParse.id)))).one()[0],
-        results=[models.OrderSheetParseRead.model_validate(parse) for parse in result.scalars()],
+        total=total,
+        results=[models.OrderSheetParseRead.model_validate(parse) for parse in parsers],
     )
 
 
 @router.get("/parser", response_model=models.OrderSheetParseRead)
 async def read_google_sheets_parser(
+    request: Request,
+    response: Response,
     spreadsheet: str,
     sheet_id: int,
     _: models.User = Depends(auth_flows.current_active_superuser),
     session=Depends(db.get_async_session),
 ):
-    return await flows.get_by_spreadsheet_sheet(session, spreadsheet, sheet_id)
+    parser = await flows.get_by_spreadsheet_sheet(session, spreadsheet, sheet_id)
+    not_modified = etag.not_modified(request, response, etag.make(etag.row_versions(parser)))
+    if not_modified:
+        return not_modified
+    return parser
 
 
 @router.post("/parser", response_model=models.OrderSheetParseRead)
@@ -233,7 +275,7 @@ async def create_order_message(data: schemas.CreateOrderSheetMessage, session=De
                 configs=data.configs,
             ),
         )
-        notifications_flows.send_sent_order_notify(preorder_read.order_id, enums.Integration.telegram, resp)
+        await notifications_flows.send_sent_order_notify(preorder_read.order_id, enums.Integration.telegram, resp)
     else:
         order = await order_flows.get_by_order_id(session, data.order_id)
         order_read = await order_flows.format_order_system(session, order)
@@ -248,7 +290,7 @@ async def create_order_message(data: schemas.CreateOrderSheetMessage, session=De
                 configs=data.configs,
             ),
         )
-        notifications_flows.send_sent_order_notify(order_read.order_id, enums.Integration.telegram, resp)
+        await notifications_flows.send_sent_order_notify(order_read.order_id, enums.Integration.telegram, resp)
 
     return resp
 
@@ -264,7 +306,7 @@ async def delete_order_message(data: schemas.DeleteOrderSheetMessage, session=De
                 order_id=preorder.id,
             ),
         )
-        notifications_flows.send_deleted_order_notify(preorder.order_id, enums.Integration.telegram, resp)
+        await notifications_flows.send_deleted_order_notify(preorder.order_id, enums.Integration.telegram, resp)
     else:
         order = await order_flows.get_by_order_id(session, data.order_id)
         resp = await message_service.delete_order_message(
@@ -274,7 +316,7 @@ async def delete_order_message(data: schemas.DeleteOrderSheetMessage, session=De
                 order_id=order.id,
             ),
         )
-        notifications_flows.send_deleted_order_notify(order.order_id, enums.Integration.telegram, resp)
+        await notifications_flows.send_deleted_order_notify(order.order_id, enums.Integration.telegram, resp)
     return resp
 
 
@@ -293,7 +335,7 @@ async def update_order_message(data: schemas.UpdateOrderSheetMessage, session=De
                 configs=data.configs,
             ),
         )
-        notifications_flows.send_edited_order_notify(preorder.order_id, enums.Integration.telegram, resp)
+        await notifications_flows.send_edited_order_notify(preorder.order_id, enums.Integration.telegram, resp)
     else:
         order = await order_flows.get_by_order_id(session, data.order_id)
         order_read = await order_flows.format_order_system(session, order)
@@ -307,5 +349,5 @@ async def update_order_message(data: schemas.UpdateOrderSheetMessage, session=De
                 configs=data.configs,
             ),
         )
-        notifications_flows.send_edited_order_notify(order.order_id, enums.Integration.telegram, resp)
+        await notifications_flows.send_edited_order_notify(order.order_id, enums.Integration.telegram, resp)
     return resp
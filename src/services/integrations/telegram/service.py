@@ -8,12 +8,16 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import models, schemas
-from src.core import config, errors
+from src.core import config, errors, http
 
-telegram_client = httpx.AsyncClient(
-    verify=False,
-    base_url=config.app.telegram_url,
-    headers={"Authorization": "Bearer " + config.app.telegram_token},
+telegram_client = http.register(
+    http.IntegrationClient(
+        "telegram",
+        config.app.telegram_url,
+        {"Authorization": "Bearer " + config.app.telegram_token},
+        endpoint_timeouts=config.app.bot_endpoint_timeouts,
+        verify=False,
+    )
 )
 
 
@@ -28,13 +32,11 @@ error = errors.ApiHTTPException(
 )
 
 
-async def request(endpoint: str, method: str, data: dict | list | BaseModel | None = None) -> httpx.Response:
+async def request(
+    endpoint: str, method: str, data: dict | list | BaseModel | None = None, *, rate_key: int | None = None
+) -> httpx.Response:
     try:
-        response = await telegram_client.request(
-            method=method,
-            url=f"api/{endpoint}",
-            json=jsonable_encoder(data),
-        )
+        response = await telegram_client.request(method, endpoint, rate_key=rate_key, json=jsonable_encoder(data))
         if response.status_code not in (200, 201, 404):
             logger.error(response.json())
             raise error from None
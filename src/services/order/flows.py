@@ -1,15 +1,21 @@
+import typing
+
 import sqlalchemy as sa
+from cashews import cache
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 from sqlalchemy.sql.functions import count
 from starlette import status
 
 from src import models, schemas
-from src.core import errors, pagination
+from src.core import config, counting, errors, pagination
 from src.services.currency import flows as currency_flows
 
 from . import service
 
+T = typing.TypeVar("T")
+
 
 async def get(session: AsyncSession, order_id: int) -> models.Order:
     order = await service.get(session, order_id)
@@ -52,14 +58,114 @@ async def create(session: AsyncSession, order_in: schemas.OrderCreate) -> models
     return order
 
 
-async def format_order_system(session: AsyncSession, order: models.Order):
+async def search(
+    session: AsyncSession, params: schemas.OrderSearchParams
+) -> pagination.Paginated[schemas.OrderReadSystem]:
+    query, count_query = service.search_query(params.query)
+    result = await session.scalars(query.offset(params.offset).limit(params.limit))
+    orders = result.unique().all()
+    currencies = await currency_flows.get_many(session, [order.date for order in orders])
+    results = [
+        await format_order_system(session, order, currency=currencies[order.date.date()]) for order in orders
+    ]
+    total, _ = await counting.count(session, count_query)
+    return pagination.Paginated(page=params.page, per_page=params.per_page, total=total, results=results)
+
+
+async def bulk_create(session: AsyncSession, orders_in: list[schemas.OrderCreate]) -> list[schemas.OrderBulkResult]:
+    existing = {order.order_id for order in await service.get_by_order_ids(session, [o.order_id for o in orders_in])}
+    results: list[schemas.OrderBulkResult] = []
+    created: dict[int, int] = {}
+    for index, order_in in enumerate(orders_in):
+        result = schemas.OrderBulkResult(order_id=order_in.order_id)
+        results.append(result)
+        if order_in.order_id in existing:
+            result.errors.append(
+                errors.ApiException(
+                    msg=f"A order with this id already exist. [order_id={order_in.order_id}]",
+                    code="already_exist",
+                )
+            )
+            continue
+        try:
+            async with session.begin_nested():
+                order = await service.create(session, order_in, commit=False)
+        except SQLAlchemyError as e:
+            result.errors.append(errors.ApiException(msg=str(e.__cause__ or e), code="invalid_data"))
+            continue
+        existing.add(order_in.order_id)
+        created[order.id] = index
+    await session.commit()
+    for order in await service.get_by_ids(session, list(created.keys())):
+        results[created[order.id]].id = order.id
+        results[created[order.id]].result = await format_order_system(session, order)
+    return results
+
+
+async def bulk_update(
+    session: AsyncSession, orders_in: list[schemas.OrderBulkUpdate], *, patch: bool = False
+) -> list[schemas.OrderBulkResult]:
+    orders = {order.id: order for order in await service.get_by_ids(session, [o.id for o in orders_in])}
+    results: list[schemas.OrderBulkResult] = []
+    updated: dict[int, schemas.OrderBulkResult] = {}
+    for order_in in orders_in:
+        result = schemas.OrderBulkResult(id=order_in.id)
+        results.append(result)
+        order = orders.get(order_in.id)
+        if order is None:
+            result.errors.append(errors.ApiException(msg="A order with this id does not exist.", code="not_exist"))
+            continue
+        result.order_id = order.order_id
+        try:
+            async with session.begin_nested():
+                update_model = schemas.OrderUpdate(**order_in.model_dump(exclude={"id"}, exclude_unset=True))
+                await service.update(session, order, update_model, patch=patch, commit=False)
+        except SQLAlchemyError as e:
+            result.errors.append(errors.ApiException(msg=str(e.__cause__ or e), code="invalid_data"))
+            continue
+        except (ValidationError, errors.ApiHTTPException) as e:
+            result.errors.extend(errors.api_exceptions(e))
+            continue
+        updated[order.id] = result
+    await session.commit()
+    for order_id, result in updated.items():
+        result.result = await format_order_system(session, orders[order_id])
+    return results
+
+
+async def _cached_payload(kind: str, order: models.Order, build: typing.Callable[[], typing.Awaitable[T]]) -> T:
+    stamp = service.payload_stamp(order)
+    if stamp is None:
+        return await build()
+    key = f"order_payload:{kind}:{order.id}:{service.PAYLOAD_VERSIONS.get(order.id, 0)}:{stamp}"
+    payload = await cache.get(key)
+    if payload is None:
+        payload = await build()
+        await cache.set(key, payload, expire=config.app.order_payload_cache_ttl)
+    return payload
+
+
+async def format_order_system(
+    session: AsyncSession, order: models.Order, *, currency: models.Currency | None = None
+) -> schemas.OrderReadSystem:
+    """``currency`` is the rate of ``order.date`` when the caller has already fetched it for a batch."""
+    return await _cached_payload("system", order, lambda: _format_order_system(session, order, currency))
+
+
+async def _format_order_system(
+    session: AsyncSession, order: models.Order, currency: models.Currency | None = None
+) -> schemas.OrderReadSystem:
     data = order.to_dict()
     booster_price = order.price.booster_dollar_fee
+    if currency is not None:
+        booster_rub = await currency_flows.usd_to_currency_prefetched(session, booster_price, currency, "RUB")
+    else:
+        booster_rub = await currency_flows.usd_to_currency(session, booster_price, order.date, "RUB")
     price = schemas.OrderPriceSystem(
         dollar=order.price.dollar,
         booster_dollar_fee=booster_price,
         booster_dollar=order.price.booster_dollar,
-        booster_rub=await currency_flows.usd_to_currency(session, booster_price, order.date, "RUB"),
+        booster_rub=booster_rub,
         booster_gold=order.price.booster_gold,
     )
     data["price"] = price
@@ -73,6 +179,13 @@ async def format_order_system(session: AsyncSession, order: models.Order):
 
 async def format_order_perms(
     session: AsyncSession, order: models.Order, *, has: bool = False
+) -> schemas.OrderReadNoPerms | schemas.OrderReadHasPerms:
+    kind = "has_perms" if has else "no_perms"
+    return await _cached_payload(kind, order, lambda: _format_order_perms(session, order, has=has))
+
+
+async def _format_order_perms(
+    session: AsyncSession, order: models.Order, *, has: bool = False
 ) -> schemas.OrderReadNoPerms | schemas.OrderReadHasPerms:
     data = order.to_dict()
     booster_price = order.price.booster_dollar_fee
@@ -126,25 +239,39 @@ async def format_order_active(
     return await format_order_active_prefetched(session, order, order_active, currency)
 
 
-async def get_by_filter(
-    session: AsyncSession, params: schemas.OrderFilterParams, *, has: bool = False
-) -> pagination.Paginated[schemas.OrderReadNoPerms | schemas.OrderReadHasPerms]:  # noqa
-    query = sa.select(models.Order).options(
-        joinedload(models.Order.info),
-        joinedload(models.Order.price),
-        joinedload(models.Order.credentials),
-        joinedload(models.Order.screenshots),
-    )
+async def project_orders(
+    session: AsyncSession, rows: typing.Sequence[sa.Row], schema: type[BaseModel]
+) -> list[dict[str, typing.Any]]:
+    """Build ``schema``-shaped dicts from ``service.projection_query`` rows without validating them."""
+    currencies = await currency_flows.get_many(session, [row.date for row in rows])
+    price_fields = schema.model_fields["price"].annotation.model_fields  # type: ignore
+    fields = [name for name in schema.model_fields if name != "price"]
+    results = []
+    for row in rows:
+        data = {name: getattr(row, name) for name in fields}
+        price = {name: getattr(row, name) for name in price_fields if name != "booster_rub"}
+        price["booster_rub"] = await currency_flows.usd_to_currency_prefetched(
+            session, row.booster_dollar_fee, currencies[row.date.date()], "RUB"
+        )
+        data["price"] = price
+        results.append(data)
+    return results
 
-    query = params.apply_filters(query)
+
+async def get_by_filter(
+    session: AsyncSession,
+    params: schemas.OrderFilterParams,
+    schema: type[BaseModel] = schemas.OrderReadNoPerms,
+) -> dict[str, typing.Any]:
+    query = params.apply_filters(service.projection_query(schema))
     query = params.apply_pagination(query)
-    result = await session.execute(query)
-    results = [await format_order_perms(session, order, has=has) for order in result.unique().scalars()]
+    rows = (await session.execute(query)).all()
     count_query = params.apply_filters(sa.select(count(models.Order.id)))
-    total = await session.execute(count_query)
-    return pagination.Paginated(
-        page=params.page,
-        per_page=params.per_page,
-        total=total.one()[0],
-        results=results,
+    total, estimated = await counting.count(session, count_query, estimate=True)
+    return pagination.paginated_dict(
+        params,
+        total,
+        await project_orders(session, rows, schema),
+        next_cursor=params.next_cursor(rows),
+        estimated=estimated,
     )
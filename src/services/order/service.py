@@ -1,12 +1,17 @@
-import copy
+import hashlib
 import typing
+from collections import defaultdict
 
 import sqlalchemy as sa
 from loguru import logger
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction, contains_eager, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from src import models, schemas
+from src.core import db
 from src.services.accounting import service as accounting_service
 
 
@@ -78,64 +83,289 @@ async def get_by_ids(session: AsyncSession, ids: list[int]) -> typing.Sequence[m
     return result.unique().all()
 
 
+async def get_by_order_ids(session: AsyncSession, orders_id: typing.Iterable[str]) -> typing.Sequence[models.Order]:
+    result = await session.scalars(
+        sa.select(models.Order)
+        .where(models.Order.order_id.in_(orders_id))
+        .options(
+            joinedload(models.Order.info),
+            joinedload(models.Order.price),
+            joinedload(models.Order.credentials),
+            joinedload(models.Order.screenshots),
+        )
+    )
+    return result.unique().all()
+
+
+def _search_pattern(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def search_query(text: str) -> tuple[sa.Select, sa.Select]:
+    # Every branch filters a single table so each one can be answered by its trigram indexes
+    pattern = _search_pattern(text)
+    ids = sa.union(
+        sa.select(models.Order.id).where(
+            models.Order.order_id.ilike(pattern, escape="\\") | models.Order.shop_order_id.ilike(pattern, escape="\\")
+        ),
+        sa.select(models.OrderInfo.order_id).where(
+            models.OrderInfo.comment.ilike(pattern, escape="\\")
+            | models.OrderInfo.purchase.ilike(pattern, escape="\\")
+            | models.OrderInfo.server.ilike(pattern, escape="\\")
+        ),
+        sa.select(models.OrderCredentials.order_id).where(
+            models.OrderCredentials.battle_tag.ilike(pattern, escape="\\")
+            | models.OrderCredentials.nickname.ilike(pattern, escape="\\")
+        ),
+    ).subquery()
+    rank = sa.func.greatest(
+        *[
+            sa.func.word_similarity(text, sa.func.coalesce(column, ""))
+            for column in (
+                models.Order.order_id,
+                models.Order.shop_order_id,
+                models.OrderInfo.comment,
+                models.OrderInfo.purchase,
+                models.OrderInfo.server,
+                models.OrderCredentials.battle_tag,
+                models.OrderCredentials.nickname,
+            )
+        ]
+    )
+    query = (
+        sa.select(models.Order)
+        .join(models.OrderInfo, models.OrderInfo.order_id == models.Order.id)
+        .join(models.OrderCredentials, models.OrderCredentials.order_id == models.Order.id)
+        .where(models.Order.id.in_(sa.select(ids.c.id)))
+        .options(
+            contains_eager(models.Order.info),
+            contains_eager(models.Order.credentials),
+            joinedload(models.Order.price),
+            selectinload(models.Order.screenshots),
+        )
+        .order_by(rank.desc(), models.Order.id.desc())
+    )
+    count_query = sa.select(sa.func.count()).select_from(ids)
+    return query, count_query
+
+
+def _json_object(model: type[db.Base], schema: type[BaseModel]) -> sa.ColumnElement:
+    pairs: list[sa.ColumnElement] = []
+    for name in schema.model_fields:
+        pairs.extend((sa.literal_column(f"'{name}'"), getattr(model, name)))
+    return sa.func.json_build_object(*pairs, type_=sa.JSON)
+
+
+def projection_query(
+    schema: type[BaseModel],
+    booster_dollar_fee: sa.ColumnElement = models.OrderPrice.booster_dollar_fee,
+) -> sa.Select:
+    """Core query with only the columns needed to build ``schema`` for a page of orders.
+
+    Info and credentials come back as JSON objects and screenshots as a JSON array, so a row
+    maps onto the schema without loading ORM instances. ``id``, ``created_at``, ``date`` and
+    ``order_id`` are always selected for keyset cursors and currency lookups.
+    """
+    fields = schema.model_fields
+    order_columns = {"id", "created_at", "date", "order_id"}
+    order_columns.update(name for name in fields if name in models.Order.__table__.c)
+    columns: list[sa.ColumnElement] = [models.Order.__table__.c[name] for name in sorted(order_columns)]
+    columns.extend(
+        (
+            models.OrderPrice.dollar,
+            models.OrderPrice.booster_dollar,
+            booster_dollar_fee.label("booster_dollar_fee"),
+            models.OrderPrice.booster_gold,
+            _json_object(models.OrderInfo, schemas.OrderInfoRead).label("info"),
+        )
+    )
+    query = sa.select(*columns).select_from(models.Order)
+    query = query.join(models.OrderInfo, models.OrderInfo.order_id == models.Order.id)
+    query = query.join(models.OrderPrice, models.OrderPrice.order_id == models.Order.id)
+    if "credentials" in fields:
+        credentials = _json_object(models.OrderCredentials, schemas.OrderCredentialsRead)
+        query = query.add_columns(credentials.label("credentials"))
+        query = query.join(models.OrderCredentials, models.OrderCredentials.order_id == models.Order.id)
+    if "screenshots" in fields:
+        screenshots = (
+            sa.select(
+                sa.func.coalesce(
+                    sa.func.json_agg(_json_object(models.Screenshot, schemas.ScreenshotRead)),
+                    sa.literal_column("'[]'::json"),
+                )
+            )
+            .where(models.Screenshot.order_id == models.Order.id)
+            .scalar_subquery()
+        )
+        query = query.add_columns(sa.type_coerce(screenshots, sa.JSON).label("screenshots"))
+    return query
+
+
+def payload_stamp(order: models.Order) -> str | None:
+    """Version of everything a formatted order payload is built from.
+
+    ``None`` means some part is not loaded (e.g. ``updated_at`` expired after an ORM flush)
+    and the payload must not be served from cache.
+    """
+    state = sa.inspect(order)
+    if state.unloaded.intersection(("updated_at", "info", "price", "credentials", "screenshots")):
+        return None
+    parts = []
+    for instance in (order, order.info, order.price, order.credentials):
+        if "updated_at" in sa.inspect(instance).unloaded:
+            return None
+        parts.append(instance.updated_at.isoformat() if instance.updated_at else "-")
+    parts.extend(str(screenshot.id) for screenshot in order.screenshots)
+    return hashlib.sha1(":".join(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+# Part of the cached payload key, so bumping it makes every cached payload of the order unreachable.
+# Process-local like the payload cache itself. Read it with ``.get(order_id, 0)`` so that only
+# invalidated orders get an entry.
+PAYLOAD_VERSIONS: dict[int, int] = defaultdict(int)
+
+_PENDING_PAYLOADS_KEY = "order_payloads_pending"
+
+
+def invalidate_payloads(session: AsyncSession, *orders_id: int) -> None:
+    """Drop the cached payloads of the orders once ``session`` commits, or right away outside a transaction."""
+    if session.in_transaction():
+        session.info.setdefault(_PENDING_PAYLOADS_KEY, set()).update(orders_id)
+        return
+    for order_id in orders_id:
+        PAYLOAD_VERSIONS[order_id] += 1
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    for order_id in session.info.pop(_PENDING_PAYLOADS_KEY, ()):
+        PAYLOAD_VERSIONS[order_id] += 1
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_soft_rollback(session: Session, previous_transaction: SessionTransaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_PAYLOADS_KEY, None)
+
+
+async def _update_returning(session: AsyncSession, model: type[db.Base], where, values: dict) -> sa.Row:
+    result = await session.execute(
+        sa.update(model)
+        .where(where)
+        .values(values)
+        .returning(*model.__table__.columns)
+        .execution_options(synchronize_session=False)
+    )
+    return result.one()
+
+
+async def _update_price_returning(session: AsyncSession, order_id: int, values: dict) -> sa.Row:
+    """Update the order price, returning the new row plus the replaced value as ``old_booster_dollar_fee``.
+
+    The old value is read in the same statement from a locked subquery,
+    so it does not depend on what the session has loaded.
+    """
+    old = (
+        sa.select(models.OrderPrice.id, models.OrderPrice.booster_dollar_fee)
+        .where(models.OrderPrice.order_id == order_id)
+        .with_for_update()
+        .subquery("old")
+    )
+    result = await session.execute(
+        sa.update(models.OrderPrice)
+        .where(models.OrderPrice.id == old.c.id)
+        .values(values)
+        .returning(*models.OrderPrice.__table__.columns, old.c.booster_dollar_fee.label("old_booster_dollar_fee"))
+        .execution_options(synchronize_session=False)
+    )
+    return result.one()
+
+
+def _apply_returning(instance: db.Base | None, row: sa.Row) -> None:
+    if instance is None:
+        return
+    for column in instance.__table__.columns:
+        set_committed_value(instance, column.key, row._mapping[column.key])
+
+
 async def update(
     session: AsyncSession,
     order: models.Order,
     order_in: schemas.OrderUpdate,
     patch: bool = False,
+    *,
+    commit: bool = True,
 ) -> models.Order:
-    old = copy.deepcopy(order)
+    loaded = not sa.inspect(order).unloaded.intersection(("info", "price", "credentials", "screenshots"))
     update_data = order_in.model_dump(
         exclude={"price", "info", "credentials"},
         exclude_none=not patch,
         exclude_unset=patch,
     )
     if update_data:
-        for field, value in update_data.items():
-            setattr(order, field, value)
-    session.add(order)
+        row = await _update_returning(session, models.Order, models.Order.id == order.id, update_data)
+        _apply_returning(order, row)
     if order_in.info is not None:
         info_update = order_in.info.model_dump(exclude_unset=patch)
         if info_update:
-            await session.execute(sa.update(models.OrderInfo).filter_by(order_id=order.id).values(info_update))
+            row = await _update_returning(session, models.OrderInfo, models.OrderInfo.order_id == order.id, info_update)
+            _apply_returning(order.info if loaded else None, row)
     if order_in.credentials is not None:
         credentials_update = order_in.credentials.model_dump(exclude_unset=patch)
         if credentials_update:
-            await session.execute(
-                sa.update(models.OrderCredentials).filter_by(order_id=order.id).values(credentials_update)
+            row = await _update_returning(
+                session, models.OrderCredentials, models.OrderCredentials.order_id == order.id, credentials_update
             )
+            _apply_returning(order.credentials if loaded else None, row)
     if order_in.price is not None:
         update_data_price = order_in.price.model_dump(exclude_unset=patch)
         if update_data_price:
-            await session.execute(sa.update(models.OrderPrice).filter_by(order_id=order.id).values(update_data_price))
-            await accounting_service.update_booster_price(session, old, order)
+            row = await _update_price_returning(session, order.id, update_data_price)
+            await accounting_service.update_booster_price(
+                session, order.id, row.old_booster_dollar_fee, row.booster_dollar_fee
+            )
+            _apply_returning(order.price if loaded else None, row)
 
     if order.status == models.OrderStatus.Refund:
         user_orders = await accounting_service.get_by_order_id(session, order.id)
+        await accounting_service.update_active_orders(session, [d.user_id for d in user_orders if d.completed], 1)
         for user_order in user_orders:
             user_order.completed = False
             user_order.paid = False
             user_order.refunded = True
         session.add_all(user_orders)
+    invalidate_payloads(session, order.id)
+    if not commit:
+        await session.flush()
+        return order
     await session.commit()
     logger.info(f"Order updated [id={order.id} order_id={order.order_id}]]")
-    return await get(session, order.id)  # type: ignore
+    if not loaded:
+        return await get(session, order.id)  # type: ignore
+    return order
 
 
 async def delete(session: AsyncSession, order_id: int) -> None:
     order = await get(session, order_id)
     if order:
+        user_orders = await accounting_service.get_by_order_id(session, order_id)
+        await accounting_service.update_active_orders(session, [d.user_id for d in user_orders if not d.completed], -1)
         await session.execute(sa.delete(models.Order).where(models.Order.id == order_id))
         await session.commit()
+        invalidate_payloads(session, order_id)
         logger.info(f"Order deleted [id={order.id} order_id={order.order_id}]]")
 
 
-async def create(session: AsyncSession, order_in: schemas.OrderCreate) -> models.Order:
+async def create(session: AsyncSession, order_in: schemas.OrderCreate, *, commit: bool = True) -> models.Order:
     order = models.Order(**order_in.model_dump(exclude={"price", "info", "credentials"}))
     order.info = models.OrderInfo(order_id=order.id, **order_in.info.model_dump())
     order.price = models.OrderPrice(order_id=order.id, **order_in.price.model_dump())
     order.credentials = models.OrderCredentials(order_id=order.id, **order_in.credentials.model_dump())
     session.add(order)
+    if not commit:
+        await session.flush()
+        return order
     await session.commit()
     logger.info(f"Order created [id={order.id} order_id={order.order_id}]]")
     return await get(session, order.id)  # type: ignore
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import ORJSONResponse
 
 from src import models, schemas
 from src.core import db, enums, pagination
 from src.services.auth import flows as auth_flows
+from src.utils import etag
 
 from . import flows, service
 
@@ -15,16 +17,23 @@ async def get_orders(
     _=Depends(auth_flows.current_active_verified),
     session=Depends(db.get_async_session),
 ):
-    return await flows.get_by_filter(session, params)
+    return ORJSONResponse(await flows.get_by_filter(session, params))
 
 
 @router.get(path="", response_model=schemas.OrderReadNoPerms)
 async def get_order(
     order_id: int,
+    request: Request,
+    response: Response,
     _=Depends(auth_flows.current_active_verified),
     session=Depends(db.get_async_session),
 ):
     order = await flows.get(session, order_id)
+    stamp = service.payload_stamp(order)
+    if stamp is not None:
+        not_modified = etag.not_modified(request, response, etag.make("no_perms", order.id, stamp))
+        if not_modified:
+            return not_modified
     return await flows.format_order_perms(session, order)
 
 
@@ -52,6 +61,33 @@ async def patch_order(
     return await flows.format_order_system(session, patched_order)
 
 
+@router.post("/bulk", response_model=list[schemas.OrderBulkResult])
+async def create_orders(
+    data: list[schemas.OrderCreate],
+    _=Depends(auth_flows.current_active_superuser),
+    session=Depends(db.get_async_session),
+):
+    return await flows.bulk_create(session, data)
+
+
+@router.put("/bulk", response_model=list[schemas.OrderBulkResult])
+async def update_orders(
+    data: list[schemas.OrderBulkUpdate],
+    _=Depends(auth_flows.current_active_superuser),
+    session=Depends(db.get_async_session),
+):
+    return await flows.bulk_update(session, data)
+
+
+@router.patch("/bulk", response_model=list[schemas.OrderBulkResult])
+async def patch_orders(
+    data: list[schemas.OrderBulkUpdate],
+    _=Depends(auth_flows.current_active_superuser),
+    session=Depends(db.get_async_session),
+):
+    return await flows.bulk_update(session, data, patch=True)
+
+
 @router.delete("", response_model=schemas.OrderReadSystem)
 async def delete_order(
     order_id: int,
@@ -0,0 +1,33 @@
+import asyncio
+import typing
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import models, schemas
+from src.core import db
+from src.services.integrations.message import service as message_service
+from src.services.integrations.sheets import service as sheets_service
+
+
+async def _delete_order_message(session: AsyncSession, payload: dict) -> None:
+    result = await message_service.delete_order_message(session, schemas.DeleteOrderMessage.model_validate(payload))
+    failed = [skipped.channel_id for skipped in result.skipped if skipped.status == models.CallbackStatus.FAILED]
+    if failed:
+        raise RuntimeError(f"Bot could not delete messages [channels_id={failed}]")
+
+
+async def _sheets_update_order(session: AsyncSession, payload: dict) -> None:
+    creds = await sheets_service.get_first_superuser_token(session)
+    parser = models.OrderSheetParseRead.model_validate(payload["parser"])
+    await asyncio.to_thread(sheets_service.update_row_data, creds.token, parser, payload["row_id"], payload["data"])
+
+
+HANDLERS: dict[models.OutboxKind, typing.Callable[[AsyncSession, dict], typing.Awaitable[None]]] = {
+    models.OutboxKind.DELETE_ORDER_MESSAGE: _delete_order_message,
+    models.OutboxKind.SHEETS_UPDATE_ORDER: _sheets_update_order,
+}
+
+
+async def deliver(entry: models.Outbox) -> None:
+    async with db.async_session_maker() as session:
+        await HANDLERS[entry.kind](session, entry.payload)
@@ -0,0 +1,83 @@
+import typing
+from datetime import UTC, datetime, timedelta
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src import models
+from src.core import config
+
+
+def add(
+    session: AsyncSession,
+    kind: models.OutboxKind,
+    payload: dict[str, typing.Any],
+    *,
+    order_id: int | None = None,
+    preorder_id: int | None = None,
+) -> models.Outbox:
+    """Queue a side effect in the caller's transaction; it is delivered only if that transaction commits."""
+    entry = models.Outbox(kind=kind, payload=payload, order_id=order_id, preorder_id=preorder_id)
+    session.add(entry)
+    return entry
+
+
+async def claim(session: AsyncSession, limit: int) -> typing.Sequence[models.Outbox]:
+    """Lock the next deliverable entries and mark them in flight for ``outbox_lock_timeout`` seconds.
+
+    The row locks only last until the caller commits; after that ``locked_until`` keeps other workers
+    away while the entries are delivered. An entry is held back while an older pending entry of the
+    same order (or preorder) exists, so side effects of one order are delivered in the order they were written.
+    """
+    now = datetime.now(UTC)
+    older = aliased(models.Outbox)
+    pending = models.Outbox.processed_at.is_(None) & (models.Outbox.attempts < config.app.outbox_max_attempts)
+    blocked = (
+        sa.select(older.id)
+        .where(
+            sa.or_(older.order_id == models.Outbox.order_id, older.preorder_id == models.Outbox.preorder_id),
+            older.id < models.Outbox.id,
+            older.processed_at.is_(None),
+            older.attempts < config.app.outbox_max_attempts,
+        )
+        .exists()
+    )
+    free = models.Outbox.locked_until.is_(None) | (models.Outbox.locked_until < now)
+    query = (
+        sa.select(models.Outbox)
+        .where(pending, free, models.Outbox.available_at <= now, ~blocked)
+        .order_by(models.Outbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.scalars(query)
+    entries = result.all()
+    locked_until = now + timedelta(seconds=config.app.outbox_lock_timeout)
+    for entry in entries:
+        entry.locked_until = locked_until
+    return entries
+
+
+async def get_by_ids(session: AsyncSession, ids: typing.Iterable[int]) -> typing.Sequence[models.Outbox]:
+    result = await session.scalars(sa.select(models.Outbox).where(models.Outbox.id.in_(list(ids))))
+    return result.all()
+
+
+def mark_processed(entry: models.Outbox) -> None:
+    entry.processed_at = datetime.now(UTC)
+    entry.locked_until = None
+    entry.error = None
+
+
+def mark_failed(entry: models.Outbox, error: str) -> None:
+    entry.attempts += 1
+    entry.error = error
+    entry.locked_until = None
+    entry.available_at = datetime.now(UTC) + timedelta(seconds=min(2**entry.attempts, 600))
+
+
+async def delete_processed(session: AsyncSession, older_than: timedelta) -> None:
+    await session.execute(
+        sa.delete(models.Outbox).where(models.Outbox.processed_at < datetime.now(UTC) - older_than)
+    )
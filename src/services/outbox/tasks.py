@@ -0,0 +1,54 @@
+import asyncio
+from datetime import timedelta
+
+from loguru import logger
+
+from src import models
+from src.core import config, db
+
+from . import flows, service
+
+
+async def _deliver(limit: asyncio.Semaphore, entry: models.Outbox) -> BaseException | None:
+    async with limit:
+        try:
+            await flows.deliver(entry)
+        except Exception as e:
+            return e
+    return None
+
+
+async def drain() -> int:
+    """Deliver pending outbox entries batch by batch until none is due.
+
+    Each batch is claimed in one short transaction and its results recorded in another, so no row
+    lock or connection is held across the bot and Sheets calls. Deliveries run at most
+    ``outbox_delivery_concurrency`` at a time, each in its own session, which keeps the worker well
+    inside the connection pool.
+    """
+    delivered = 0
+    limit = asyncio.Semaphore(config.app.outbox_delivery_concurrency)
+    while True:
+        async with db.async_session_maker() as session:
+            entries = await service.claim(session, config.app.outbox_batch_size)
+            await session.commit()
+        if not entries:
+            return delivered
+
+        # A batch holds at most one entry per order, so they can be delivered concurrently
+        results = await asyncio.gather(*(_deliver(limit, entry) for entry in entries))
+        outcome = {entry.id: result for entry, result in zip(entries, results)}
+
+        async with db.async_session_maker() as session:
+            for entry in await service.get_by_ids(session, outcome):
+                error = outcome[entry.id]
+                if error is not None:
+                    logger.error(f"Outbox delivery failed [id={entry.id} kind={entry.kind}]: {error!r}")
+                    service.mark_failed(entry, repr(error))
+                else:
+                    service.mark_processed(entry)
+                    delivered += 1
+            await service.delete_processed(session, timedelta(days=1))
+            await session.commit()
+        if len(entries) < config.app.outbox_batch_size:
+            return delivered
@@ -1,3 +1,5 @@
+import typing
+
 import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
@@ -5,7 +7,7 @@ from sqlalchemy.sql.functions import count
 from starlette import status
 
 from src import models, schemas
-from src.core import errors, pagination
+from src.core import counting, errors, pagination
 from src.services.currency import flows as currency_flows
 
 from . import service
@@ -74,10 +76,10 @@ async def format_preorder_perms(session: AsyncSession, order: models.PreOrder):
     return schemas.PreOrderReadUser.model_validate(data)
 
 
-async def get_by_filter(
+async def get_page(
     session: AsyncSession,
     params: pagination.PaginationParams,
-) -> pagination.Paginated[schemas.PreOrderReadUser]:
+) -> tuple[typing.Sequence[models.PreOrder], int]:
     query = (
         sa.select(models.PreOrder)
         .options(joinedload(models.PreOrder.info), joinedload(models.PreOrder.price))
@@ -86,11 +88,27 @@ async def get_by_filter(
         .order_by(params.order_by)
     )
     result = await session.execute(query)
-    results = [await format_preorder_perms(session, order) for order in result.scalars()]
-    total = await session.execute(sa.select(count(models.PreOrder.id)))
+    total, _ = await counting.count(session, sa.select(count(models.PreOrder.id)))
+    return result.scalars().all(), total
+
+
+async def format_page(
+    session: AsyncSession,
+    params: pagination.PaginationParams,
+    preorders: typing.Sequence[models.PreOrder],
+    total: int,
+) -> pagination.Paginated[schemas.PreOrderReadUser]:
     return pagination.Paginated(
         page=params.page,
         per_page=params.per_page,
-        total=total.one()[0],
-        results=results,
+        total=total,
+        results=[await format_preorder_perms(session, order) for order in preorders],
     )
+
+
+async def get_by_filter(
+    session: AsyncSession,
+    params: pagination.PaginationParams,
+) -> pagination.Paginated[schemas.PreOrderReadUser]:
+    preorders, total = await get_page(session, params)
+    return await format_page(session, params, preorders, total)
@@ -62,8 +62,32 @@ async def get_order_id(session: AsyncSession, order_id: str) -> models.PreOrder
     return result.first()
 
 
+async def get_by_ids(session: AsyncSession, ids: typing.Iterable[int]) -> typing.Sequence[models.PreOrder]:
+    result = await session.scalars(
+        sa.select(models.PreOrder)
+        .where(models.PreOrder.id.in_(ids))
+        .options(joinedload(models.PreOrder.info), joinedload(models.PreOrder.price))
+        .execution_options(populate_existing=True)
+    )
+    return result.all()
+
+
+async def get_by_order_ids(session: AsyncSession, orders_id: typing.Iterable[str]) -> typing.Sequence[models.PreOrder]:
+    result = await session.scalars(
+        sa.select(models.PreOrder)
+        .where(models.PreOrder.order_id.in_(orders_id))
+        .options(joinedload(models.PreOrder.info), joinedload(models.PreOrder.price))
+    )
+    return result.all()
+
+
 async def update(
-    session: AsyncSession, order: models.PreOrder, order_in: schemas.PreOrderUpdate, patch: bool = False
+    session: AsyncSession,
+    order: models.PreOrder,
+    order_in: schemas.PreOrderUpdate,
+    patch: bool = False,
+    *,
+    commit: bool = True,
 ) -> models.PreOrder:
     update_data = order_in.model_dump(exclude={"price", "info"}, exclude_unset=patch)
     if order_in.has_response is None:
@@ -79,16 +103,23 @@ async def update(
         await session.execute(
             sa.update(models.PreOrderPrice).where(models.PreOrderPrice.order_id == order.id).values(**price_update)
         )
+    if not commit:
+        return order
     await session.commit()
     logger.info(f"PreOrder updated [id={order.id} order_id={order.order_id}]]")
     return await get(session, order.id)  # type: ignore
 
 
-async def create(session: AsyncSession, pre_order_in: schemas.PreOrderCreate) -> models.PreOrder:
+async def create(
+    session: AsyncSession, pre_order_in: schemas.PreOrderCreate, *, commit: bool = True
+) -> models.PreOrder:
     pre_order = models.PreOrder(**pre_order_in.model_dump(exclude={"price", "info"}))
     pre_order.info = models.PreOrderInfo(order_id=pre_order.id, **pre_order_in.info.model_dump())
     pre_order.price = models.PreOrderPrice(order_id=pre_order.id, **pre_order_in.price.model_dump())
     session.add(pre_order)
+    if not commit:
+        await session.flush()
+        return pre_order
     await session.commit()
     logger.info(f"PreOrder created [id={pre_order.id} order_id={pre_order.order_id}]]")
     return await get(session, pre_order.id)  # type: ignore
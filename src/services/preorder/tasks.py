@@ -41,7 +41,7 @@ async def manage_preorders():
                         ),
                     )
                 if payload.deleted:
-                    notifications_flows.send_deleted_order_notify(preorder.order_id, payload)
+                    await notifications_flows.send_deleted_order_notify(preorder.order_id, payload)
                 if preorder.has_response is False and order is None:
                     parser = await sheets_service.get_by_spreadsheet_sheet_read(
                         session, preorder.spreadsheet, preorder.sheet_id
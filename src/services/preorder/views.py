@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
 from src import models, schemas
 from src.core import db, enums, pagination
 from src.services.auth import flows as auth_flows
+from src.utils import etag
 
 from . import flows, service
 
@@ -11,11 +12,18 @@ router = APIRouter(prefix="/preorders", tags=[enums.RouteTag.PREORDERS])
 
 @router.get(path="/filter", response_model=pagination.Paginated[schemas.PreOrderReadUser])
 async def get_preorders(
+    request: Request,
+    response: Response,
     paging: pagination.PaginationParams = Depends(),
     _=Depends(auth_flows.current_active_verified),
     session=Depends(db.get_async_session),
 ):
-    return flows.get_by_filter(session, paging)
+    preorders, total = await flows.get_page(session, paging)
+    versions = [etag.row_versions(order, order.info, order.price) for order in preorders]
+    not_modified = etag.not_modified(request, response, etag.make(paging.model_dump(mode="json"), total, versions))
+    if not_modified:
+        return not_modified
+    return await flows.format_page(session, paging, preorders, total)
 
 
 @router.get(path="", response_model=schemas.PreOrderReadUser)
@@ -4,12 +4,13 @@ from sqlalchemy.orm import joinedload
 from starlette import status
 
 from src import models, schemas
-from src.core import enums, errors, pagination
+from src.core import counting, enums, errors, pagination
 from src.services.accounting import flows as accounting_flows
 from src.services.integrations.message import service as message_flows
 from src.services.integrations.notifications import flows as notifications_flows
 from src.services.integrations.render import flows as render_flows
 from src.services.order import flows as order_flows
+from src.services.outbox import service as outbox_service
 from src.services.preorder import flows as preorder_flows
 from src.services.preorder import service as preorder_service
 
@@ -114,6 +115,8 @@ async def create_order_response(
 async def approve_response(session: AsyncSession, user: models.User, order: models.Order) -> models.Response:
     await order_available(session, order)
     await accounting_flows.can_user_pick_order(session, user, order)
+    # Queued before add_booster so the entries are committed together with the booster
+    _delete_order_messages(session, order.id)
     await accounting_flows.add_booster(session, order, user)
     responds = await service.get_by_order_id(session, order.id)
     user_read = schemas.UserRead.model_validate(user, from_attributes=True)
@@ -133,7 +136,7 @@ async def approve_response(session: AsyncSession, user: models.User, order: mode
                     render_flows.get_order_configs(order_read, creds=True),
                     data={"order": order_read},
                 )
-                notifications_flows.send_response_approved(
+                await notifications_flows.send_response_approved(
                     user_read,
                     order_read,
                     schemas.ResponseRead.model_validate(resp),
@@ -141,26 +144,19 @@ async def approve_response(session: AsyncSession, user: models.User, order: mode
                 )
             else:
                 await _decline_response(session, resp, order)
-    notifications_flows.send_response_chose_notify(
+    await notifications_flows.send_response_chose_notify(
         order.order_id, await notifications_flows.get_user_accounts(session, user_read), len(responds)
     )
-    await message_flows.delete_order_message(
-        session,
-        data=schemas.DeleteOrderMessage(
-            order_id=order.id,
-            integration=enums.Integration.telegram,
-        ),
-    )
-    await message_flows.delete_order_message(
-        session,
-        data=schemas.DeleteOrderMessage(
-            order_id=order.id,
-            integration=enums.Integration.discord,
-        ),
-    )
     return await get_by_order_id_user_id(session, order.id, user.id)
 
 
+def _delete_order_messages(session: AsyncSession, order_id: int, *, is_preorder: bool = False) -> None:
+    key = {"preorder_id": order_id} if is_preorder else {"order_id": order_id}
+    for integration in (enums.Integration.telegram, enums.Integration.discord):
+        data = schemas.DeleteOrderMessage(order_id=order_id, integration=integration, is_preorder=is_preorder)
+        outbox_service.add(session, models.OutboxKind.DELETE_ORDER_MESSAGE, data.model_dump(mode="json"), **key)
+
+
 async def _decline_response(session: AsyncSession, response: models.Response, order: models.Order) -> None:
     user_declined = schemas.UserRead.model_validate(response.user, from_attributes=True)
     await service.update(
@@ -169,7 +165,7 @@ async def _decline_response(session: AsyncSession, response: models.Response, or
         schemas.ResponseUpdate(approved=False, closed=True),
         patch=True,
     )
-    notifications_flows.send_response_declined(user_declined, order.order_id)
+    await notifications_flows.send_response_declined(user_declined, order.order_id)
 
 
 async def decline_response(session: AsyncSession, user: models.User, order: models.Order) -> models.Response:
@@ -183,22 +179,7 @@ async def decline_response(session: AsyncSession, user: models.User, order: mode
 async def approve_preorder_response(
     session: AsyncSession, user: models.User, order: models.PreOrder
 ) -> models.Response:
-    await message_flows.delete_order_message(
-        session,
-        data=schemas.DeleteOrderMessage(
-            order_id=order.id,
-            integration=enums.Integration.telegram,
-            is_preorder=True,
-        ),
-    )
-    await message_flows.delete_order_message(
-        session,
-        data=schemas.DeleteOrderMessage(
-            order_id=order.id,
-            integration=enums.Integration.discord,
-            is_preorder=True,
-        ),
-    )
+    _delete_order_messages(session, order.id, is_preorder=True)
     for resp in await service.get_by_order_id(session, order_id=order.id):
         await service.update(
             session,
@@ -218,7 +199,7 @@ async def _decline_preorder_response(session: AsyncSession, response: models.Res
         schemas.ResponseUpdate(approved=False, closed=True),
         patch=True,
     )
-    notifications_flows.send_response_declined(user_declined, order.order_id)
+    await notifications_flows.send_response_declined(user_declined, order.order_id)
 
 
 async def decline_preorder_response(
@@ -240,11 +221,13 @@ async def get_by_filter(
     query = params.apply_filter(query)
     query = params.apply_pagination(query)
     result = await session.execute(query)
-    results = [schemas.ResponseRead.model_validate(resp, from_attributes=True) for resp in result.scalars().all()]
-    total = await session.execute(params.apply_filter(sa.select(sa.func.count(models.Response.id))))
+    responses = result.scalars().all()
+    results = [schemas.ResponseRead.model_validate(resp, from_attributes=True) for resp in responses]
+    total, _ = await counting.count(session, params.apply_filter(sa.select(sa.func.count(models.Response.id))))
     return pagination.Paginated(
         results=results,
-        total=total.scalar_one(),
+        total=total,
         page=params.page,
         per_page=params.per_page,
+        next_cursor=params.next_cursor(responses),
     )
@@ -6,8 +6,9 @@ from starlette import status
 from yarl import URL
 
 from src import models, schemas
-from src.core import errors, pagination
+from src.core import counting, errors, pagination
 from src.services.accounting import service as accounting_service
+from src.services.order import service as order_service
 
 link_regex = re.compile(r"((https?):((//)|(\\\\))+([\w\d:#@%/;$()~_?\+-=\\\.&](#!)?)*)", re.DOTALL)
 
@@ -51,6 +52,7 @@ async def create(
     )
     session.add(model)
     await session.commit()
+    order_service.invalidate_payloads(session, order.id)
     return model
 
 
@@ -74,6 +76,7 @@ async def bulk_create(
         screenshots.append(model)
     session.add_all(screenshots)
     await session.commit()
+    order_service.invalidate_payloads(session, order.id)
     return screenshots
 
 
@@ -105,19 +108,22 @@ async def delete(session: AsyncSession, user: models.User, screenshot: models.Sc
 
     await session.delete(screenshot)
     await session.commit()
+    order_service.invalidate_payloads(session, screenshot.order_id)
     return screenshot
 
 
 async def get_by_filter(session: AsyncSession, params: schemas.ScreenshotParams):
     query = params.apply_filters(sa.select(models.Screenshot))
     result = await session.scalars(params.apply_pagination(query))
-    total = await session.execute(params.apply_filters(sa.select(sa.func.count(models.Screenshot.id))))
-    results = [schemas.ScreenshotRead.model_validate(row, from_attributes=True) for row in result.all()]
+    total, _ = await counting.count(session, params.apply_filters(sa.select(sa.func.count(models.Screenshot.id))))
+    screenshots = result.all()
+    results = [schemas.ScreenshotRead.model_validate(row, from_attributes=True) for row in screenshots]
     return pagination.Paginated(
         results=results,
-        total=total.scalar_one(),
+        total=total,
         page=params.page,
         per_page=params.per_page,
+        next_cursor=params.next_cursor(screenshots),
     )
 
 
@@ -1,6 +1,7 @@
 import asyncio
 
 import sentry_sdk
+from cashews import cache
 from celery import Celery
 from celery.signals import celeryd_init
 from sentry_sdk.integrations.celery import CeleryIntegration
@@ -10,6 +11,7 @@ from src.core import config, db
 from src.services.auth import tasks as auth_tasks
 from src.services.integrations.sheets import service as sheets_service
 from src.services.integrations.sheets import tasks as sheets_tasks
+from src.services.outbox import tasks as outbox_tasks
 from src.services.preorder import tasks as preorders_tasks
 
 from . import celery_config
@@ -21,6 +23,8 @@ celery = Celery(
     broker_connection_retry_on_startup=True,
 )
 celery.config_from_object(celery_config)
+# The order service caches formatted payloads; tasks run outside the API process and need their own backend
+cache.setup("mem://")
 
 
 @celeryd_init.connect
@@ -42,6 +46,10 @@ celery.conf.beat_schedule = {
         "task": "manage_preorders",
         "schedule": config.app.celery_preorders_manage,
     },
+    "drain_outbox": {
+        "task": "drain_outbox",
+        "schedule": config.app.outbox_drain_interval,
+    },
     "remove_expired_tokens-every-5-minutes": {
         "task": "remove_expired_tokens",
         "schedule": config.app.celery_remove_expired_tokens,
@@ -98,3 +106,9 @@ def manage_preorders():
 def remove_expired_tokens():
     loop = asyncio.get_event_loop()
     loop.run_until_complete(auth_tasks.remove_expired_tokens())
+
+
+@celery.task(name="drain_outbox")
+def drain_outbox():
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(outbox_tasks.drain())
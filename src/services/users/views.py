@@ -60,7 +60,7 @@ async def filter_active_orders(
     user=Depends(auth_flows.current_active_verified),
     session=Depends(db.get_async_session),
 ):
-    return await accounting_flows.get_by_filter(session, user, params)
+    return ORJSONResponse(await accounting_flows.get_by_filter(session, user, params))
 
 
 @router.get("/@me/orders", response_model=schemas.OrderReadActive)
@@ -101,7 +101,7 @@ async def request_verification(user=Depends(auth_flows.current_active), session=
         raise errors.ApiHTTPException(
             status_code=400, detail=[errors.ApiException(code="already_verified", msg="User already verified")]
         )
-    notifications_flows.send_request_verify(
+    await notifications_flows.send_request_verify(
         await notifications_flows.get_user_accounts(session, schemas.UserRead.model_validate(user))
     )
     return ORJSONResponse({"detail": "ok"})
@@ -0,0 +1,41 @@
+import hashlib
+import typing
+
+import orjson
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.core import db
+
+
+def make(*parts: typing.Any) -> str:
+    digest = hashlib.sha1(orjson.dumps(parts, default=str), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def row_versions(*instances: db.TimeStampMixin | None) -> list[tuple[int, str | None]]:
+    return [
+        (instance.id, instance.updated_at.isoformat() if instance.updated_at else None)
+        for instance in instances
+        if instance is not None
+    ]
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def not_modified(request: Request, response: Response, tag: str) -> Response | None:
+    """Set ``ETag`` on the response and return a ``304`` when ``If-None-Match`` matches it.
+
+    Uses the weak comparison from RFC 9110, so ``W/"x"`` and ``"x"`` match.
+    """
+    response.headers["ETag"] = tag
+    header = request.headers.get("If-None-Match")
+    if header is None:
+        return None
+    if header.strip() == "*" or _opaque(tag) in {_opaque(value) for value in header.split(",")}:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": tag})
+    return None
@@ -0,0 +1,34 @@
+import os
+
+# Settings without defaults, so that src can be imported without a .env file
+for key, value in {
+    "PORT": "8000",
+    "TELEGRAM_TOKEN": "test",
+    "TELEGRAM_URL": "http://telegram.test",
+    "TELEGRAM_INTEGRATION": "true",
+    "TELEGRAM_TOKEN_BOT": "test",
+    "DISCORD_TOKEN": "test",
+    "DISCORD_URL": "http://discord.test",
+    "DISCORD_INTEGRATION": "true",
+    "DISCORD_TOKEN_BOT": "test",
+    "DISCORD_CLIENT_ID": "1",
+    "DISCORD_CLIENT_SECRET": "test",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "ACCESS_TOKEN_SECRET": "test",
+    "REFRESH_TOKEN_SECRET": "test",
+    "RESET_PASSWORD_SECRET": "test",
+    "VERIFY_EMAIL_SECRET": "test",
+    "DISCORD_OAUTH_SECRET": "test",
+    "SUPER_USER_USERNAME": "admin",
+    "SUPER_USER_EMAIL": "admin@example.com",
+    "SUPER_USER_PASSWORD": "test",
+    "CELERY_BROKER_URL": "redis://localhost",
+    "CELERY_RESULT_BACKEND": "redis://localhost",
+    "REDIS_URL": "redis://localhost",
+    "CURRENCY_API_TOKEN": "test",
+}.items():
+    os.environ.setdefault(key, value)
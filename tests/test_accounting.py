@@ -0,0 +1,38 @@
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src import models
+from src.services.accounting import service as accounting_service
+
+
+async def _dollars_after_price_change(dollars: list[float], old_fee: float, new_fee: float) -> list[float]:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(models.UserOrder.__table__.create)
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            models.UserOrder(id=i, user_id=i, order_id=1, dollars=d, order_date=datetime.now(UTC))
+            for i, d in enumerate(dollars, start=1)
+        )
+        await session.commit()
+        await accounting_service.update_booster_price(session, 1, old_fee, new_fee)
+        result = await session.scalars(sa.select(models.UserOrder.dollars).order_by(models.UserOrder.id))
+        values = list(result)
+    await engine.dispose()
+    return values
+
+
+@pytest.mark.parametrize(
+    ("dollars", "old_fee", "new_fee", "expected"),
+    [
+        ([50.0, 50.0], 100.0, 120.0, [60.0, 60.0]),
+        ([30.0, 70.0], 100.0, 80.0, [20.0, 60.0]),
+        ([100.0], 100.0, 100.0, [100.0]),
+    ],
+)
+def test_update_booster_price_moves_dollars_by_fee_delta(dollars, old_fee, new_fee, expected):
+    assert asyncio.run(_dollars_after_price_change(dollars, old_fee, new_fee)) == pytest.approx(expected)
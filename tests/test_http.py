@@ -0,0 +1,51 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.core import http
+
+
+def _client(handler) -> http.IntegrationClient:
+    client = http.IntegrationClient("test", "http://bot.test")
+    client.client = httpx.AsyncClient(base_url="http://bot.test", transport=httpx.MockTransport(handler))
+    client.breaker = http.CircuitBreaker(threshold=1, reset_timeout=0.0)
+    client.breaker.failure()
+    return client
+
+
+def test_cancelled_probe_releases_half_open_circuit():
+    started = asyncio.Event()
+
+    async def hang(request: httpx.Request) -> httpx.Response:
+        started.set()
+        await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    async def run() -> http.IntegrationClient:
+        client = _client(hang)
+        assert client.breaker.state == http.CircuitBreaker.HALF_OPEN
+        probe = asyncio.create_task(client._send("GET", "capabilities"))
+        await started.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        return client
+
+    client = asyncio.run(run())
+    assert client.breaker.probing is False
+    assert client.breaker.allow() is True
+
+
+def test_probe_with_unexpected_error_releases_half_open_circuit():
+    def broken(request: httpx.Request) -> httpx.Response:
+        raise RuntimeError("boom")
+
+    async def run() -> http.IntegrationClient:
+        client = _client(broken)
+        with pytest.raises(RuntimeError):
+            await client._send("GET", "capabilities")
+        return client
+
+    client = asyncio.run(run())
+    assert client.breaker.allow() is True
@@ -0,0 +1,150 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+import sqlalchemy as sa
+from cashews import cache
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src import models, schemas
+from src.core import enums, http, ratelimit
+from src.services.integrations.discord import service as discord_service
+from src.services.integrations.message import service as message_service
+
+cache.setup("mem://")
+
+ORDER_ID = 1
+
+
+class StubBot:
+    """Discord bot double behind ``httpx.MockTransport``.
+
+    ``capabilities`` of ``None`` answers ``404`` as a bot without the endpoint does; ``statuses`` maps a
+    channel to the callback status a delete reports for it.
+    """
+
+    def __init__(self, capabilities: dict | None, statuses: dict[int, models.CallbackStatus], reachable: bool = True):
+        self.capabilities = capabilities
+        self.statuses = statuses
+        self.reachable = reachable
+        self.requests: list[tuple[str, str]] = []
+
+    def _callback(self, message: dict) -> dict:
+        channel_id = message["channel_id"]
+        status = self.statuses[channel_id]
+        if status == models.CallbackStatus.DELETED:
+            return {"deleted": [{"channel_id": channel_id, "message_id": message["message_id"], "status": status}]}
+        return {"skipped": [{"channel_id": channel_id, "status": status}]}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/api/")
+        self.requests.append((request.method, path))
+        if not self.reachable:
+            raise httpx.ConnectError("bot is down", request=request)
+        if path == "capabilities":
+            if self.capabilities is None:
+                return httpx.Response(404, json={"detail": "Not Found"})
+            return httpx.Response(200, json=self.capabilities)
+        body = json.loads(request.content)
+        if path == "message/order/bulk":
+            callback: dict[str, list] = {"deleted": [], "skipped": []}
+            for message in body["messages"]:
+                for key, value in self._callback(message).items():
+                    callback[key].extend(value)
+            return httpx.Response(200, json=callback)
+        return httpx.Response(200, json=self._callback(body["message"]))
+
+
+@pytest.fixture
+def bot(monkeypatch: pytest.MonkeyPatch):
+    def install(stub: StubBot) -> StubBot:
+        client = httpx.AsyncClient(base_url="http://discord.test", transport=httpx.MockTransport(stub))
+        monkeypatch.setattr(discord_service.discord_client, "client", client)
+        return stub
+
+    monkeypatch.setattr(
+        discord_service.discord_client, "breaker", http.CircuitBreaker(threshold=5, reset_timeout=30.0)
+    )
+    # Locks and semaphores bind to the loop of the first test that waits on them
+    monkeypatch.setattr(ratelimit, "_buckets", {})
+    monkeypatch.setattr(message_service, "_fan_out_limits", {})
+    asyncio.run(cache.clear())
+    return install
+
+
+async def _delete_order_messages(channels: list[int]) -> tuple[schemas.MessageCallback, list[int]]:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(models.OrderMessage.__table__.create)
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            models.OrderMessage(
+                id=channel_id,
+                order_id=ORDER_ID,
+                channel_id=channel_id,
+                message_id=100 + channel_id,
+                integration=enums.Integration.discord,
+            )
+            for channel_id in channels
+        )
+        await session.commit()
+        data = schemas.DeleteOrderMessage(integration=enums.Integration.discord, order_id=ORDER_ID)
+        callback = await message_service.delete_order_message(session, data)
+        result = await session.scalars(sa.select(models.OrderMessage.channel_id).order_by(models.OrderMessage.id))
+        kept = list(result)
+    await engine.dispose()
+    return callback, kept
+
+
+STATUSES = {
+    1: models.CallbackStatus.DELETED,
+    2: models.CallbackStatus.FAILED,
+    3: models.CallbackStatus.NOT_FOUND,
+}
+
+
+@pytest.mark.parametrize(
+    ("capabilities", "expected_requests"),
+    [
+        (None, [("DELETE", "message/order")] * 3),
+        ({"bulk_messages": False}, [("DELETE", "message/order")] * 3),
+        ({"bulk_messages": True}, [("DELETE", "message/order/bulk")]),
+    ],
+    ids=["no capabilities endpoint", "bulk disabled", "bulk"],
+)
+def test_delete_order_message_keeps_failed(bot, capabilities, expected_requests):
+    stub = bot(StubBot(capabilities, STATUSES))
+
+    callback, kept = asyncio.run(_delete_order_messages(list(STATUSES)))
+
+    assert stub.requests == [("GET", "capabilities"), *expected_requests]
+    assert [message.channel_id for message in callback.deleted] == [1]
+    assert sorted((skipped.channel_id, skipped.status) for skipped in callback.skipped) == [
+        (2, models.CallbackStatus.FAILED),
+        (3, models.CallbackStatus.NOT_FOUND),
+    ]
+    assert kept == [2]
+
+
+def test_delete_order_message_unreachable_bot(bot):
+    stub = bot(StubBot({"bulk_messages": True}, STATUSES, reachable=False))
+
+    callback, kept = asyncio.run(_delete_order_messages(list(STATUSES)))
+
+    # The capability probe fails too, so the delete falls back to one request per channel
+    assert stub.requests == [("GET", "capabilities"), *[("DELETE", "message/order")] * 3]
+    assert {skipped.status for skipped in callback.skipped} == {models.CallbackStatus.FAILED}
+    assert kept == [1, 2, 3]
+
+
+def test_capabilities_failure_is_not_cached(bot):
+    stub = bot(StubBot({"bulk_messages": True}, STATUSES, reachable=False))
+    asyncio.run(_delete_order_messages(list(STATUSES)))
+
+    stub.reachable = True
+    stub.requests.clear()
+    callback, kept = asyncio.run(_delete_order_messages(list(STATUSES)))
+
+    assert stub.requests == [("GET", "capabilities"), ("DELETE", "message/order/bulk")]
+    assert kept == [2]
@@ -0,0 +1,38 @@
+import asyncio
+
+from src import models, schemas
+from src.services.integrations.notifications import dispatcher
+
+
+def _notification(index: int) -> schemas.NotificationSendSystem:
+    return schemas.NotificationSendSystem(type=models.NotificationType.LOGGED_NOTIFY, data={"index": index})
+
+
+async def _submit_all(put_timeout: float, count: int) -> tuple[list[int], dict[str, int]]:
+    sent: list[int] = []
+    release = asyncio.Event()
+
+    async def handler(batch: list) -> None:
+        await release.wait()
+        sent.extend(item.data["index"] for item in batch)
+
+    notifications = dispatcher.NotificationDispatcher(handler, size=1, workers=1, batch_size=1, put_timeout=put_timeout)
+    asyncio.get_running_loop().call_later(0.05, release.set)
+    for index in range(count):
+        await notifications.submit(_notification(index))
+    stats = notifications.stats()
+    await notifications.drain(1.0)
+    return sorted(sent), stats
+
+
+def test_full_queue_waits_for_room():
+    sent, stats = asyncio.run(_submit_all(put_timeout=1.0, count=4))
+    assert sent == [0, 1, 2, 3]
+    assert stats["waited"] > 0
+    assert stats["overflowed"] == 0
+
+
+def test_full_queue_sends_inline_after_timeout():
+    sent, stats = asyncio.run(_submit_all(put_timeout=0.01, count=4))
+    assert sent == [0, 1, 2, 3]
+    assert stats["overflowed"] > 0
@@ -0,0 +1,34 @@
+import datetime
+import typing
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from src import models
+from src.core import pagination
+
+
+class UserMessageParams(pagination.PaginationParams):
+    sort_model: typing.ClassVar = models.UserMessage
+
+
+def _sql(params: UserMessageParams) -> str:
+    query = params.apply_pagination(sa.select(models.UserMessage))
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_keyset_sort_uses_cursor():
+    now = datetime.datetime.now(datetime.UTC)
+    params = UserMessageParams(per_page=2)
+    params.cursor = params.next_cursor([models.UserMessage(id=i, created_at=now) for i in (5, 7)])
+    sql = _sql(params)
+    assert "(integration_user_message.created_at, integration_user_message.id) >" in sql
+    assert "OFFSET" not in sql
+
+
+def test_other_sort_falls_back_to_offset():
+    params = UserMessageParams(sort="channel_id", page=3, per_page=2, cursor="ignored")
+    sql = _sql(params)
+    assert "ORDER BY channel_id" in sql
+    assert "OFFSET 4" in sql
+    assert params.next_cursor([models.UserMessage(id=1), models.UserMessage(id=2)]) is None
@@ -0,0 +1,249 @@
+"""Query plan checks for the hot service lookups.
+
+Runs ``EXPLAIN`` for the statements the service functions in ``cases()`` issue against the configured Postgres
+and fails when a table with at least ``EXPLAIN_MIN_ROWS`` rows is read with a sequential scan instead of an index.
+``EXPLAIN_SEED`` synthetic orders are inserted first; everything happens in a single transaction that is rolled back
+at the end, so it is safe against a staging copy. Skipped when the database is not reachable.
+
+    EXPLAIN_SEED=100000 pytest tests/test_query_plans.py
+"""
+
+import asyncio
+import datetime
+import os
+import typing
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+
+from src import models, schemas
+from src.core import db, enums
+from src.services.accounting import service as accounting_service
+from src.services.integrations.channel import service as channel_service
+from src.services.integrations.message import service as message_service
+from src.services.order import service as order_service
+from src.services.preorder import service as preorder_service
+from src.services.response import service as response_service
+
+SEED_ID = 10**12
+BATCH = 5000
+
+
+def _insert(connection: Connection, model: type[db.Base], rows: typing.Iterable[dict]) -> None:
+    batch: list[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH:
+            connection.execute(sa.insert(model), batch)
+            batch = []
+    if batch:
+        connection.execute(sa.insert(model), batch)
+
+
+def seed(connection: Connection, size: int) -> None:
+    now = datetime.datetime.now(datetime.UTC)
+    users = max(size // 100, 1)
+    preorders = max(size // 10, 1)
+    _insert(
+        connection,
+        models.User,
+        (
+            {"id": SEED_ID + i, "email": f"explain{i}@example.com", "hashed_password": "-", "name": f"explain{i}"}
+            for i in range(users)
+        ),
+    )
+    _insert(
+        connection,
+        models.Order,
+        (
+            {
+                "id": SEED_ID + i,
+                "created_at": now - datetime.timedelta(seconds=i),
+                "order_id": f"X{i}",
+                "spreadsheet": f"explain{i % 10}",
+                "sheet_id": i % 7,
+                "row_id": i,
+                "date": now - datetime.timedelta(minutes=i),
+                "shop_order_id": f"shop-{i}",
+                "status": models.OrderStatus.InProgress,
+                "status_paid": models.OrderPaidStatus.NotPaid,
+            }
+            for i in range(size)
+        ),
+    )
+    for model, extra in (
+        (models.OrderInfo, lambda i: {"boost_type": "x", "game": f"game{i % 5}", "purchase": f"purchase {i}"}),
+        (models.OrderPrice, lambda i: {"dollar": 10.0, "booster_dollar": 5.0, "booster_dollar_fee": 4.0}),
+        (models.OrderCredentials, lambda i: {"battle_tag": f"tag#{i}", "nickname": f"nick{i}"}),
+        (models.UserOrder, lambda i: {"user_id": SEED_ID + i % users, "dollars": 4.0, "order_date": now}),
+        (models.Response, lambda i: {"user_id": SEED_ID + i % users}),
+        (
+            models.OrderMessage,
+            lambda i: {"channel_id": i % 50, "message_id": i, "integration": enums.Integration.discord},
+        ),
+        (
+            models.ResponseMessage,
+            lambda i: {
+                "channel_id": i % 50,
+                "message_id": i,
+                "integration": enums.Integration.discord,
+                "user_id": SEED_ID + i % users,
+            },
+        ),
+    ):
+        _insert(connection, model, ({"id": SEED_ID + i, "order_id": SEED_ID + i, **extra(i)} for i in range(size)))
+    _insert(
+        connection,
+        models.PreOrder,
+        (
+            {
+                "id": SEED_ID + i,
+                "order_id": f"P{i}",
+                "spreadsheet": f"explain{i % 10}",
+                "sheet_id": i % 7,
+                "row_id": i,
+                "date": now,
+            }
+            for i in range(preorders)
+        ),
+    )
+    _insert(
+        connection,
+        models.PreOrderInfo,
+        (
+            {"id": SEED_ID + i, "order_id": SEED_ID + i, "boost_type": "x", "game": "game", "purchase": "p"}
+            for i in range(preorders)
+        ),
+    )
+    _insert(
+        connection,
+        models.PreOrderPrice,
+        ({"id": SEED_ID + i, "order_id": SEED_ID + i, "dollar": 10.0} for i in range(preorders)),
+    )
+    _insert(
+        connection,
+        models.Channel,
+        (
+            {
+                "id": SEED_ID + i,
+                "game": f"game{i % 20}",
+                "category": f"category{i}",
+                "integration": enums.Integration.discord,
+                "channel_id": i,
+            }
+            for i in range(size // 100 or 1)
+        ),
+    )
+    for table in db.Base.metadata.sorted_tables:
+        connection.exec_driver_sql(f'ANALYZE "{table.name}"')
+
+
+class _Result:
+    """Empty stand-in for the result objects the service functions read from."""
+
+    def __getattr__(self, name: str) -> typing.Callable[..., typing.Any]:
+        return lambda *args, **kwargs: self if name in ("scalars", "unique") else []
+
+    def first(self) -> None:
+        return None
+
+
+class _RecordingSession:
+    """Captures the statement a service function issues instead of running it."""
+
+    def __init__(self) -> None:
+        self.statements: list[sa.Select] = []
+
+    async def _record(self, statement: sa.Select, *args: typing.Any, **kwargs: typing.Any) -> _Result:
+        self.statements.append(statement)
+        return _Result()
+
+    execute = scalars = _record
+
+
+def issued(call: typing.Callable[[typing.Any], typing.Awaitable[typing.Any]]) -> sa.Select:
+    session = _RecordingSession()
+    asyncio.run(call(session))
+    (statement,) = session.statements
+    return statement
+
+
+def cases() -> list[tuple[str, sa.Select]]:
+    order_id = SEED_ID + 42
+    discord = enums.Integration.discord
+    keyset = schemas.OrderFilterParams(per_page=1)
+    keyset.cursor = keyset.next_cursor([models.Order(id=order_id, created_at=datetime.datetime.now(datetime.UTC))])
+    search, _ = order_service.search_query("tag#42")
+    return [
+        ("order by id", issued(lambda s: order_service.get(s, order_id))),
+        ("order by order_id", issued(lambda s: order_service.get_order_id(s, "X42"))),
+        ("orders by sheet", issued(lambda s: order_service.get_all_by_sheet(s, "explain2", 0))),
+        ("boosters by order", issued(lambda s: accounting_service.get_by_order_id(s, order_id))),
+        (
+            "response by order and user",
+            issued(lambda s: response_service.get_by_order_id_user_id(s, order_id, SEED_ID)),
+        ),
+        ("responses by user", issued(lambda s: response_service.get_by_user_id(s, SEED_ID))),
+        (
+            "order messages by order",
+            issued(lambda s: message_service.get_messages_by_order_id(s, discord, order_id)),
+        ),
+        (
+            "response message by order and user",
+            issued(lambda s: message_service.get_message_by_order_id_user_id(s, discord, order_id, SEED_ID)),
+        ),
+        (
+            "channels by game and category",
+            issued(lambda s: channel_service.get_by_game_categories(s, discord, "game1", ["category1"])),
+        ),
+        ("preorder by order_id", issued(lambda s: preorder_service.get_order_id(s, "P42"))),
+        (
+            "preorders by sheet entity",
+            issued(lambda s: preorder_service.get_all_by_sheet_entity(s, "explain2", 0, 42)),
+        ),
+        ("orders keyset page", keyset.apply_pagination(sa.select(models.Order))),
+        ("orders search", search.limit(10)),
+    ]
+
+
+INDEX_NODES = frozenset({"Index Scan", "Index Only Scan", "Bitmap Index Scan"})
+
+
+def _nodes(plan: dict) -> typing.Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+@pytest.fixture(scope="module")
+def connection() -> typing.Iterator[Connection]:
+    try:
+        connection = db.engine.connect()
+    except sa.exc.OperationalError as e:
+        pytest.skip(f"Postgres is not reachable: {e}")
+    transaction = connection.begin()
+    try:
+        seed(connection, int(os.environ.get("EXPLAIN_SEED", 50_000)))
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="module")
+def sizes(connection: Connection) -> dict[str, float]:
+    return dict(connection.exec_driver_sql("SELECT relname, reltuples FROM pg_class WHERE relkind = 'r'").all())
+
+
+@pytest.mark.parametrize(("name", "query"), cases(), ids=[name for name, _ in cases()])
+def test_query_uses_index(connection: Connection, sizes: dict[str, float], name: str, query: sa.Select) -> None:
+    min_rows = int(os.environ.get("EXPLAIN_MIN_ROWS", 10_000))
+    compiled = query.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled.string}").scalar_one()
+    nodes = list(_nodes(plan[0]["Plan"]))
+    large = {node["Relation Name"] for node in nodes if sizes.get(node.get("Relation Name"), 0) >= min_rows}
+    seq_scans = sorted({node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"} & large)
+    assert not seq_scans, f"{name}: sequential scan on {', '.join(seq_scans)}"
+    if large:
+        assert any(node["Node Type"] in INDEX_NODES for node in nodes), f"{name}: no index used"
@@ -0,0 +1,82 @@
+import asyncio
+import datetime
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+from src import models, schemas
+from src.core import db
+from src.services.integrations.sheets import flows as sheets_flows
+
+
+@compiles(sa.BigInteger, "sqlite")
+def _bigint_sqlite(type_, compiler, **kw):
+    # SQLite only autoincrements an INTEGER PRIMARY KEY
+    return "INTEGER"
+
+
+TABLES = [
+    models.Order.__table__,
+    models.OrderInfo.__table__,
+    models.OrderPrice.__table__,
+    models.OrderCredentials.__table__,
+    models.Screenshot.__table__,
+    models.PreOrder.__table__,
+    models.PreOrderInfo.__table__,
+    models.PreOrderPrice.__table__,
+]
+
+
+def _row(row_id: int, price: dict) -> models.OrderReadSheets:
+    return models.OrderReadSheets(
+        spreadsheet="sheet",
+        sheet_id=0,
+        row_id=row_id,
+        order_id=f"X{row_id}",
+        date=datetime.datetime.now(datetime.UTC),
+        shop=None,
+        shop_order_id=f"shop-{row_id}",
+        status=models.OrderStatus.InProgress,
+        status_paid=models.OrderPaidStatus.NotPaid,
+        info={"boost_type": "x", "game": "game", "purchase": "purchase"},
+        price=price,
+        credentials={},
+        auth_date=None,
+        end_date=None,
+    )
+
+
+async def _create(rows: list[models.OrderReadSheets]) -> tuple[list[schemas.SheetEntityBulkResult], list[str]]:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(db.Base.metadata.create_all, tables=TABLES)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        entities = [models.SheetEntity(spreadsheet=r.spreadsheet, sheet_id=r.sheet_id, row_id=r.row_id) for r in rows]
+        results = await sheets_flows.create_orders_from_sheets(session, entities, models.User(id=1))
+        created = list(await session.scalars(sa.select(models.Order.order_id).order_by(models.Order.order_id)))
+    await engine.dispose()
+    return results, created
+
+
+def test_create_orders_from_sheets_reports_bad_row(monkeypatch: pytest.MonkeyPatch):
+    good = _row(1, {"dollar": 10.0, "booster_dollar": 5.0, "booster_dollar_fee": 4.0})
+    bad = _row(2, {"dollar": 10.0})
+
+    async def get_orders_from_sheets(session, data, user):
+        return [good, bad]
+
+    async def format_order_system(session, order):
+        return None
+
+    monkeypatch.setattr(sheets_flows, "get_orders_from_sheets", get_orders_from_sheets)
+    monkeypatch.setattr(sheets_flows.order_flows, "format_order_system", format_order_system)
+
+    results, created = asyncio.run(_create([good, bad]))
+
+    assert created == ["X1"]
+    assert results[0].errors == []
+    assert results[1].order_id == "X2"
+    assert {error.code for error in results[1].errors} == {"invalid_data"}
+    assert any("booster_dollar" in error.msg for error in results[1].errors)